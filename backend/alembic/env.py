@@ -36,6 +36,19 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 target_metadata = Base.metadata
 
+# 全文検索の仮想テーブル・ビュー・trigram インデックスは app/search.py とマイグレーションの
+# 生 SQL で管理しているため、autogenerate / `alembic check` の比較対象から外す
+SEARCH_INDEX_NAMES = ("ix_items_search_trgm", "ix_items_name_key_trgm")
+
+
+def include_name(name, type_, parent_names) -> bool:
+    if type_ == "table":
+        return not (name.startswith("items_fts") or name == "items_search")
+    if type_ == "index":
+        return name not in SEARCH_INDEX_NAMES
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -59,6 +72,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -79,7 +93,9 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,135 @@
+"""Add normalized search keys for items, scouts and leaders
+
+Revision ID: 5e3b8c1d7a20
+Revises: c4d9e2a7b1f3
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+import re
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5e3b8c1d7a20"
+down_revision: Union[str, Sequence[str], None] = "c4d9e2a7b1f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+KEY_COLUMNS = [
+    ("items", "name", "name_key"),
+    ("leaders", "name", "name_key"),
+    ("scouts", "name", "name_key"),
+    ("scouts", "name_kana", "name_kana_key"),
+]
+
+_KATAKANA_TO_HIRAGANA = {code: code - 0x60 for code in range(0x30A1, 0x30F7)}
+
+
+def _normalize(value):
+    # app.normalize.normalize_search_key と同じ規則（マイグレーション時点で固定）
+    if value is None:
+        return None
+    key = unicodedata.normalize("NFKC", value).casefold()
+    return re.sub(r"\s+", "", key.translate(_KATAKANA_TO_HIRAGANA))
+
+
+SQLITE_FTS_COLUMNS = "name, category, location, note, name_key"
+
+SQLITE_FTS_DROP = [
+    "DROP TRIGGER IF EXISTS items_fts_au",
+    "DROP TRIGGER IF EXISTS items_fts_ad",
+    "DROP TRIGGER IF EXISTS items_fts_ai",
+    "DROP TABLE IF EXISTS items_fts",
+]
+
+
+def _sqlite_fts_create(columns: str) -> list[str]:
+    new_values = ", ".join(f"new.{name.strip()}" for name in columns.split(","))
+    old_values = ", ".join(f"old.{name.strip()}" for name in columns.split(","))
+    return [
+        f"""
+        CREATE VIRTUAL TABLE items_fts USING fts5(
+            {columns},
+            content='items', content_rowid='id', tokenize='trigram'
+        )
+        """,
+        f"""
+        CREATE TRIGGER items_fts_ai AFTER INSERT ON items BEGIN
+            INSERT INTO items_fts(rowid, {columns}) VALUES (new.id, {new_values});
+        END
+        """,
+        f"""
+        CREATE TRIGGER items_fts_ad AFTER DELETE ON items BEGIN
+            INSERT INTO items_fts(items_fts, rowid, {columns})
+            VALUES ('delete', old.id, {old_values});
+        END
+        """,
+        f"""
+        CREATE TRIGGER items_fts_au AFTER UPDATE OF {columns} ON items BEGIN
+            INSERT INTO items_fts(items_fts, rowid, {columns})
+            VALUES ('delete', old.id, {old_values});
+            INSERT INTO items_fts(rowid, {columns}) VALUES (new.id, {new_values});
+        END
+        """,
+        "INSERT INTO items_fts(items_fts) VALUES ('rebuild')",
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+
+    for table_name, _, key_column in KEY_COLUMNS:
+        op.add_column(table_name, sa.Column(key_column, sa.String(), nullable=True))
+
+    # 既存行の検索キーを埋める
+    for table_name, source_column, key_column in KEY_COLUMNS:
+        rows = bind.execute(
+            sa.text(f"SELECT id, {source_column} FROM {table_name}")
+        ).fetchall()
+        if rows:
+            bind.execute(
+                sa.text(f"UPDATE {table_name} SET {key_column} = :key WHERE id = :id"),
+                [{"id": row_id, "key": _normalize(value)} for row_id, value in rows],
+            )
+
+    for table_name, _, key_column in KEY_COLUMNS:
+        op.create_index(
+            op.f(f"ix_{table_name}_{key_column}"),
+            table_name,
+            [key_column],
+            unique=False,
+            postgresql_ops={key_column: "text_pattern_ops"},
+        )
+
+    if bind.dialect.name == "sqlite":
+        for statement in SQLITE_FTS_DROP + _sqlite_fts_create(SQLITE_FTS_COLUMNS):
+            op.execute(sa.text(statement))
+    elif bind.dialect.name == "postgresql":
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_items_name_key_trgm "
+            "ON items USING gin (name_key gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        for statement in SQLITE_FTS_DROP:
+            op.execute(sa.text(statement))
+    elif bind.dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_items_name_key_trgm")
+
+    for table_name, _, key_column in reversed(KEY_COLUMNS):
+        op.drop_index(op.f(f"ix_{table_name}_{key_column}"), table_name=table_name)
+        op.drop_column(table_name, key_column)
+
+    if bind.dialect.name == "sqlite":
+        for statement in _sqlite_fts_create("name, category, location, note"):
+            op.execute(sa.text(statement))
@@ -0,0 +1,40 @@
+"""Add table_versions for cache invalidation
+
+Revision ID: 9a6f0b2c4d81
+Revises: 5e3b8c1d7a20
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9a6f0b2c4d81"
+down_revision: Union[str, Sequence[str], None] = "5e3b8c1d7a20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    table_versions = op.create_table(
+        "table_versions",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.bulk_insert(
+        table_versions,
+        [
+            {"name": name, "version": 0}
+            for name in ("categories", "groups", "items", "leaders", "scouts")
+        ],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("table_versions")
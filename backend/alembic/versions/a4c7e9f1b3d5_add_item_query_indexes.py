@@ -0,0 +1,50 @@
+"""Add indexes for item, scout and leader list queries
+
+Revision ID: a4c7e9f1b3d5
+Revises: f3b1c8e5a7d2
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a4c7e9f1b3d5"
+down_revision: Union[str, Sequence[str], None] = "f3b1c8e5a7d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 未削除の行だけを含む部分インデックスの条件
+ACTIVE = sa.column("is_deleted") == sa.false()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_items_status_id", "items", ["status", "id"])
+    op.create_index("ix_items_status_name", "items", ["status", "name", "id"])
+    op.create_index("ix_items_owner_group_id", "items", ["owner_group_id"])
+    op.create_index("ix_items_category", "items", ["category"])
+    for table in ("scouts", "leaders"):
+        op.create_index(f"ix_{table}_is_deleted_id", table, ["is_deleted", "id"])
+        op.create_index(
+            f"ix_{table}_active_name",
+            table,
+            ["name", "id"],
+            sqlite_where=ACTIVE,
+            postgresql_where=ACTIVE,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ("leaders", "scouts"):
+        op.drop_index(f"ix_{table}_active_name", table_name=table)
+        op.drop_index(f"ix_{table}_is_deleted_id", table_name=table)
+    op.drop_index("ix_items_category", table_name="items")
+    op.drop_index("ix_items_owner_group_id", table_name="items")
+    op.drop_index("ix_items_status_name", table_name="items")
+    op.drop_index("ix_items_status_id", table_name="items")
@@ -0,0 +1,224 @@
+"""Normalize item category into a foreign key to categories
+
+Revision ID: b8d2f4a6c1e3
+Revises: a4c7e9f1b3d5
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8d2f4a6c1e3"
+down_revision: Union[str, Sequence[str], None] = "a4c7e9f1b3d5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+FTS_COLUMNS = "name, category, location, note, name_key"
+
+SQLITE_FTS_DROP = [
+    "DROP TRIGGER IF EXISTS items_fts_category_au",
+    "DROP TRIGGER IF EXISTS items_fts_au",
+    "DROP TRIGGER IF EXISTS items_fts_ad",
+    "DROP TRIGGER IF EXISTS items_fts_ai",
+    "DROP TABLE IF EXISTS items_fts",
+    "DROP VIEW IF EXISTS items_search",
+]
+
+
+def _category_name(alias: str) -> str:
+    return f"coalesce((SELECT name FROM categories WHERE id = {alias}.category_id), '')"
+
+
+# カテゴリ名はビュー経由で索引し、カテゴリ名の変更もトリガーで反映する（app/search.py と同じ内容）
+SQLITE_FTS_CREATE = [
+    """
+    CREATE VIEW items_search AS
+    SELECT items.id, items.name, coalesce(categories.name, '') AS category,
+           items.location, items.note, items.name_key
+    FROM items LEFT JOIN categories ON categories.id = items.category_id
+    """,
+    f"""
+    CREATE VIRTUAL TABLE items_fts USING fts5(
+        {FTS_COLUMNS},
+        content='items_search', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER items_fts_ai AFTER INSERT ON items BEGIN
+        INSERT INTO items_fts(rowid, {FTS_COLUMNS})
+        VALUES (new.id, new.name, {_category_name("new")}, new.location, new.note, new.name_key);
+    END
+    """,
+    f"""
+    CREATE TRIGGER items_fts_ad AFTER DELETE ON items BEGIN
+        INSERT INTO items_fts(items_fts, rowid, {FTS_COLUMNS})
+        VALUES ('delete', old.id, old.name, {_category_name("old")},
+                old.location, old.note, old.name_key);
+    END
+    """,
+    f"""
+    CREATE TRIGGER items_fts_au
+    AFTER UPDATE OF name, category_id, location, note, name_key ON items BEGIN
+        INSERT INTO items_fts(items_fts, rowid, {FTS_COLUMNS})
+        VALUES ('delete', old.id, old.name, {_category_name("old")},
+                old.location, old.note, old.name_key);
+        INSERT INTO items_fts(rowid, {FTS_COLUMNS})
+        VALUES (new.id, new.name, {_category_name("new")}, new.location, new.note, new.name_key);
+    END
+    """,
+    f"""
+    CREATE TRIGGER items_fts_category_au
+    AFTER UPDATE OF name ON categories BEGIN
+        INSERT INTO items_fts(items_fts, rowid, {FTS_COLUMNS})
+        SELECT 'delete', id, name, old.name, location, note, name_key
+        FROM items WHERE category_id = old.id;
+        INSERT INTO items_fts(rowid, {FTS_COLUMNS})
+        SELECT id, name, new.name, location, note, name_key
+        FROM items WHERE category_id = new.id;
+    END
+    """,
+    "INSERT INTO items_fts(items_fts) VALUES ('rebuild')",
+]
+
+# 5e3b8c1d7a20 時点の FTS（items を直接参照）
+SQLITE_FTS_CREATE_LEGACY = [
+    f"""
+    CREATE VIRTUAL TABLE items_fts USING fts5(
+        {FTS_COLUMNS},
+        content='items', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER items_fts_ai AFTER INSERT ON items BEGIN
+        INSERT INTO items_fts(rowid, {FTS_COLUMNS})
+        VALUES (new.id, new.name, new.category, new.location, new.note, new.name_key);
+    END
+    """,
+    f"""
+    CREATE TRIGGER items_fts_ad AFTER DELETE ON items BEGIN
+        INSERT INTO items_fts(items_fts, rowid, {FTS_COLUMNS})
+        VALUES ('delete', old.id, old.name, old.category, old.location, old.note, old.name_key);
+    END
+    """,
+    f"""
+    CREATE TRIGGER items_fts_au AFTER UPDATE OF {FTS_COLUMNS} ON items BEGIN
+        INSERT INTO items_fts(items_fts, rowid, {FTS_COLUMNS})
+        VALUES ('delete', old.id, old.name, old.category, old.location, old.note, old.name_key);
+        INSERT INTO items_fts(rowid, {FTS_COLUMNS})
+        VALUES (new.id, new.name, new.category, new.location, new.note, new.name_key);
+    END
+    """,
+    "INSERT INTO items_fts(items_fts) VALUES ('rebuild')",
+]
+
+POSTGRES_SEARCH_INDEX = """
+    CREATE INDEX ix_items_search_trgm ON items USING gin (
+        ({columns}) gin_trgm_ops
+    )
+"""
+POSTGRES_DOCUMENT = "name || ' ' || location || ' ' || coalesce(note, '')"
+POSTGRES_DOCUMENT_LEGACY = (
+    "name || ' ' || category || ' ' || location || ' ' || coalesce(note, '')"
+)
+
+items = sa.table(
+    "items",
+    sa.column("id", sa.Integer),
+    sa.column("category", sa.String),
+    sa.column("category_id", sa.Integer),
+)
+categories = sa.table(
+    "categories",
+    sa.column("id", sa.Integer),
+    sa.column("name", sa.String),
+    sa.column("sort_order", sa.Integer),
+    sa.column("is_active", sa.Boolean),
+)
+
+
+def _drop_search_index(dialect: str) -> None:
+    if dialect == "sqlite":
+        for statement in SQLITE_FTS_DROP:
+            op.execute(sa.text(statement))
+    elif dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_items_search_trgm")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    dialect = bind.dialect.name
+    # テーブルを作り直す前に items を参照するトリガー・インデックスを外す
+    _drop_search_index(dialect)
+
+    op.add_column("items", sa.Column("category_id", sa.Integer(), nullable=True))
+
+    # マスタにないカテゴリ名を登録してから、名前で category_id を埋める（空文字は NULL のまま）
+    name = sa.func.trim(items.c.category)
+    registered = sa.select(categories.c.name)
+    missing = (
+        sa.select(name, sa.literal(0), sa.true())
+        .where(name != "", name.not_in(registered))
+        .distinct()
+    )
+    bind.execute(
+        categories.insert().from_select(["name", "sort_order", "is_active"], missing)
+    )
+    bind.execute(
+        items.update().values(
+            category_id=sa.select(categories.c.id)
+            .where(categories.c.name == name)
+            .scalar_subquery()
+        )
+    )
+
+    with op.batch_alter_table("items") as batch_op:
+        batch_op.drop_index("ix_items_category")
+        batch_op.drop_column("category")
+        batch_op.create_foreign_key(
+            "fk_items_category_id_categories", "categories", ["category_id"], ["id"]
+        )
+        batch_op.create_index("ix_items_category_id", ["category_id"])
+
+    if dialect == "sqlite":
+        for statement in SQLITE_FTS_CREATE:
+            op.execute(sa.text(statement))
+    elif dialect == "postgresql":
+        op.execute(POSTGRES_SEARCH_INDEX.format(columns=POSTGRES_DOCUMENT))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    dialect = bind.dialect.name
+    _drop_search_index(dialect)
+
+    op.add_column("items", sa.Column("category", sa.String(), nullable=True))
+    bind.execute(
+        items.update().values(
+            category=sa.func.coalesce(
+                sa.select(categories.c.name)
+                .where(categories.c.id == items.c.category_id)
+                .scalar_subquery(),
+                "",
+            )
+        )
+    )
+
+    with op.batch_alter_table("items") as batch_op:
+        batch_op.alter_column("category", existing_type=sa.String(), nullable=False)
+        batch_op.drop_index("ix_items_category_id")
+        batch_op.drop_constraint("fk_items_category_id_categories", type_="foreignkey")
+        batch_op.drop_column("category_id")
+        batch_op.create_index("ix_items_category", ["category"])
+
+    if dialect == "sqlite":
+        for statement in SQLITE_FTS_CREATE_LEGACY:
+            op.execute(sa.text(statement))
+    elif dialect == "postgresql":
+        op.execute(POSTGRES_SEARCH_INDEX.format(columns=POSTGRES_DOCUMENT_LEGACY))
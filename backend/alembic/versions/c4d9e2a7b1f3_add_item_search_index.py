@@ -0,0 +1,85 @@
+"""Add full-text search index for items
+
+Revision ID: c4d9e2a7b1f3
+Revises: e1a8d5c4b2f7
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4d9e2a7b1f3"
+down_revision: Union[str, Sequence[str], None] = "e1a8d5c4b2f7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SQLITE_UPGRADE = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+        name, category, location, note,
+        content='items', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_ai AFTER INSERT ON items BEGIN
+        INSERT INTO items_fts(rowid, name, category, location, note)
+        VALUES (new.id, new.name, new.category, new.location, new.note);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_ad AFTER DELETE ON items BEGIN
+        INSERT INTO items_fts(items_fts, rowid, name, category, location, note)
+        VALUES ('delete', old.id, old.name, old.category, old.location, old.note);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_au
+    AFTER UPDATE OF name, category, location, note ON items BEGIN
+        INSERT INTO items_fts(items_fts, rowid, name, category, location, note)
+        VALUES ('delete', old.id, old.name, old.category, old.location, old.note);
+        INSERT INTO items_fts(rowid, name, category, location, note)
+        VALUES (new.id, new.name, new.category, new.location, new.note);
+    END
+    """,
+    "INSERT INTO items_fts(items_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS items_fts_au",
+    "DROP TRIGGER IF EXISTS items_fts_ad",
+    "DROP TRIGGER IF EXISTS items_fts_ai",
+    "DROP TABLE IF EXISTS items_fts",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_UPGRADE:
+            op.execute(sa.text(statement))
+    elif dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            """
+            CREATE INDEX IF NOT EXISTS ix_items_search_trgm ON items USING gin (
+                (name || ' ' || category || ' ' || location || ' ' || coalesce(note, ''))
+                gin_trgm_ops
+            )
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_DOWNGRADE:
+            op.execute(sa.text(statement))
+    elif dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_items_search_trgm")
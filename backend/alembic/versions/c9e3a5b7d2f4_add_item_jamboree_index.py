@@ -0,0 +1,38 @@
+"""Add partial index for the jamboree packing list
+
+Revision ID: c9e3a5b7d2f4
+Revises: b8d2f4a6c1e3
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c9e3a5b7d2f4"
+down_revision: Union[str, Sequence[str], None] = "b8d2f4a6c1e3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 持参フラグ付きの行だけを含む部分インデックスの条件
+JAMBOREE = sa.column("bring_to_jamboree") == sa.true()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_items_jamboree",
+        "items",
+        ["owner_group_id", "category_id", "location"],
+        sqlite_where=JAMBOREE,
+        postgresql_where=JAMBOREE,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_items_jamboree", table_name="items")
@@ -0,0 +1,45 @@
+"""Add storage_deletions queue
+
+Revision ID: d2f7a9c3e6b0
+Revises: 9a6f0b2c4d81
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d2f7a9c3e6b0"
+down_revision: Union[str, Sequence[str], None] = "9a6f0b2c4d81"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "storage_deletions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("path", sa.String(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("next_attempt_at", sa.DateTime(), nullable=False),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_storage_deletions_id"), "storage_deletions", ["id"], unique=False)
+    op.create_index(
+        op.f("ix_storage_deletions_next_attempt_at"),
+        "storage_deletions",
+        ["next_attempt_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_storage_deletions_next_attempt_at"), table_name="storage_deletions")
+    op.drop_index(op.f("ix_storage_deletions_id"), table_name="storage_deletions")
+    op.drop_table("storage_deletions")
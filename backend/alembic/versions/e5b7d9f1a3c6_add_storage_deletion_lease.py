@@ -0,0 +1,29 @@
+"""Add a claim lease to storage_deletions
+
+Revision ID: e5b7d9f1a3c6
+Revises: c9e3a5b7d2f4
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5b7d9f1a3c6"
+down_revision: Union[str, Sequence[str], None] = "c9e3a5b7d2f4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("storage_deletions", sa.Column("claimed_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("storage_deletions") as batch_op:
+        batch_op.drop_column("claimed_at")
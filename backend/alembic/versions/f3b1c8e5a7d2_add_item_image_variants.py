@@ -0,0 +1,30 @@
+"""Add item image variant URLs
+
+Revision ID: f3b1c8e5a7d2
+Revises: d2f7a9c3e6b0
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f3b1c8e5a7d2"
+down_revision: Union[str, Sequence[str], None] = "d2f7a9c3e6b0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("items", sa.Column("thumbnail_url", sa.String(), nullable=True))
+    op.add_column("items", sa.Column("medium_image_url", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("items", "medium_image_url")
+    op.drop_column("items", "thumbnail_url")
@@ -0,0 +1,37 @@
+"""管理者認証（`X-Admin-Password` ヘッダー）"""
+import os
+from typing import Optional
+
+from dotenv import load_dotenv
+from fastapi import Header, HTTPException
+
+# app.database より先に import されても .env の値を読む
+load_dotenv()
+
+ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "")
+
+
+def validate_admin_password(password: Optional[str]) -> None:
+    if not ADMIN_PASSWORD:
+        raise HTTPException(
+            status_code=503,
+            detail="管理者パスワードが設定されていません",
+        )
+
+    if password != ADMIN_PASSWORD:
+        raise HTTPException(status_code=401, detail="管理者認証に失敗しました")
+
+
+def is_admin(password: Optional[str]) -> bool:
+    """`validate_admin_password` を通れば True（エラーにはしない）"""
+    try:
+        validate_admin_password(password)
+    except HTTPException:
+        return False
+    return True
+
+
+def require_admin_access(
+    x_admin_password: Optional[str] = Header(None, alias="X-Admin-Password"),
+) -> None:
+    validate_admin_password(x_admin_password)
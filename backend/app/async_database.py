@@ -0,0 +1,115 @@
+"""参照系エンドポイントの非同期 DB アクセス
+
+一覧・詳細などの参照系 API は `async def` で受け、DB アクセスは
+`AsyncSession`（PostgreSQL は asyncpg、SQLite は aiosqlite）で行う。
+スレッドプールを経由しないため、同時接続数がスレッド数で頭打ちにならない。
+
+クエリ組み立て（検索・ページネーション・ETag・マスタキャッシュ）は同期の
+`Session` 向けに書かれているため、`AsyncSession.run_sync` でそのまま実行する
+（I/O の待ちはイベントループに戻る）。
+
+`ASYNC_READS=0` で従来どおり同期セッションをスレッドプールで使う（比較計測用）。
+"""
+import os
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+from uuid import uuid4
+
+from fastapi import Header
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from app.database import (
+    DATABASE_PROFILE,
+    DATABASE_READ_URL,
+    ReadSessionLocal,
+    SessionLocal,
+    SQLALCHEMY_DATABASE_URL,
+    engine_options,
+    reads_from_primary,
+    set_sqlite_pragmas,
+)
+
+ASYNC_READS = os.getenv("ASYNC_READS", "1") != "0"
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+# `run(fn, *args)` で `fn(session, *args)` を実行し、結果を返す
+ReadRunner = Callable[..., Awaitable[Any]]
+
+
+def _create_async_engine(url: str) -> AsyncEngine:
+    parsed = make_url(url)
+    options = engine_options(DATABASE_PROFILE, url)
+    backend = parsed.get_backend_name()
+    if backend == "postgresql":
+        # asyncpg は sslmode を解釈しないため ssl 引数に変換する
+        sslmode = parsed.query.get("sslmode")
+        parsed = parsed.difference_update_query(["sslmode"])
+        connect_args = dict(options.get("connect_args", {}))
+        if sslmode and sslmode != "disable":
+            connect_args["ssl"] = sslmode
+        # Supabase の接続プーラー（:6543、トランザクションモード）では接続ごとの
+        # プリペアドステートメントが共有されないため、asyncpg のキャッシュを切り、名前も一意にする
+        connect_args.update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid4()}__",
+        )
+        options["connect_args"] = connect_args
+    async_engine = create_async_engine(
+        parsed.set(drivername=ASYNC_DRIVERS.get(backend, parsed.drivername)), **options
+    )
+    if backend == "sqlite":
+        event.listen(async_engine.sync_engine, "connect", set_sqlite_pragmas)
+    return async_engine
+
+
+_async_engine: Optional[AsyncEngine] = None
+_async_read_engine: Optional[AsyncEngine] = None
+_session_factories: Optional[tuple[async_sessionmaker, async_sessionmaker]] = None
+
+
+def _get_session_factories() -> tuple[async_sessionmaker, async_sessionmaker]:
+    """非同期エンジンは最初の参照時に作る（ドライバの import をコールドスタートから外す）"""
+    global _async_engine, _async_read_engine, _session_factories
+    if _session_factories is None:
+        _async_engine = _create_async_engine(SQLALCHEMY_DATABASE_URL)
+        _async_read_engine = (
+            _create_async_engine(DATABASE_READ_URL) if DATABASE_READ_URL else _async_engine
+        )
+        _session_factories = (
+            async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False),
+            async_sessionmaker(_async_read_engine, autoflush=False, expire_on_commit=False),
+        )
+    return _session_factories
+
+
+async def get_read_runner(
+    x_read_primary: Optional[str] = Header(None, alias="X-Read-Primary"),
+    x_admin_password: Optional[str] = Header(None, alias="X-Admin-Password"),
+) -> AsyncIterator[ReadRunner]:
+    """参照用セッションで同期関数を実行するランナー（`get_read_db` の非同期版）"""
+    primary = reads_from_primary(x_read_primary, x_admin_password)
+    if ASYNC_READS:
+        write_factory, read_factory = _get_session_factories()
+        async with (write_factory if primary else read_factory)() as session:
+            yield session.run_sync
+        return
+
+    db = (SessionLocal if primary else ReadSessionLocal)()
+    try:
+        yield lambda fn, *args: run_in_threadpool(fn, db, *args)
+    finally:
+        await run_in_threadpool(db.close)
+
+
+async def dispose_async_engines() -> None:
+    global _async_engine, _async_read_engine, _session_factories
+    for async_engine in {_async_engine, _async_read_engine} - {None}:
+        await async_engine.dispose()
+    _async_engine = _async_read_engine = _session_factories = None
@@ -0,0 +1,94 @@
+"""起動時のスキーマ準備
+
+`SCHEMA_MODE` で起動時の処理を切り替える。
+
+- `create`: `create_all` と検索インデックスの作成、`table_versions` の初期行の登録を行う
+  （ローカル開発用。マイグレーション 9a6f0b2c4d81 と同じ初期行）
+- `check`: `alembic_version` をプロセスごとに 1 回読み、`SCHEMA_REVISION` と一致するかだけ確認する。
+  スキーマの変更は `alembic upgrade head` で事前に適用しておく。
+  DB が古い（`OLDER_REVISIONS`）ときだけ起動を止め、知らないリビジョン
+  （配備より先にマイグレーションを適用した場合）は警告を出して続ける
+
+AWS Lambda（`AWS_LAMBDA_FUNCTION_NAME` が設定されている環境）では `check` が既定で、
+コールドスタートごとにテーブル定義を照合するコストを払わない。
+Lambda の配備物には `alembic/` を含めないため、期待するリビジョンはここに定数で持つ。
+マイグレーションを追加したら、それまでの `SCHEMA_REVISION` を `OLDER_REVISIONS` に加えてから
+`SCHEMA_REVISION` を更新すること。
+"""
+import logging
+import os
+from typing import Optional
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_REVISION = "e5b7d9f1a3c6"
+# このコードが前提とするスキーマに達していないリビジョン
+OLDER_REVISIONS = frozenset({
+    "cd65016c92fc", "8b2a6f4c1a9e", "1f3a2b7c9e4d", "b7a1c2d3e4f5", "e1a8d5c4b2f7",
+    "c4d9e2a7b1f3", "5e3b8c1d7a20", "9a6f0b2c4d81", "d2f7a9c3e6b0", "f3b1c8e5a7d2",
+    "a4c7e9f1b3d5", "b8d2f4a6c1e3", "c9e3a5b7d2f4",
+})
+# Mangum は呼び出しごとに startup / shutdown を実行するため、Lambda では
+# プロセス単位の資源を shutdown で片付けず、プロセスの終了まで使い続ける
+ON_LAMBDA = bool(os.getenv("AWS_LAMBDA_FUNCTION_NAME"))
+SCHEMA_MODE = os.getenv("SCHEMA_MODE", "check" if ON_LAMBDA else "create")
+
+
+class SchemaMismatch(RuntimeError):
+    pass
+
+
+def current_revision(engine: Engine) -> Optional[str]:
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except DBAPIError:
+        return None
+
+
+_checked_engines: set[Engine] = set()
+
+
+def check_schema(engine: Engine) -> None:
+    # Lambda では startup が呼び出しごとに走るため、確認できたエンジンは覚えておく
+    if engine in _checked_engines:
+        return
+    revision = current_revision(engine)
+    if revision is None or revision in OLDER_REVISIONS:
+        raise SchemaMismatch(
+            f"Database schema is at revision {revision}, expected {SCHEMA_REVISION}; "
+            "run `alembic upgrade head`"
+        )
+    if revision != SCHEMA_REVISION:
+        logger.warning(
+            "Database schema is at revision %s, newer than %s; continuing",
+            revision, SCHEMA_REVISION,
+        )
+    _checked_engines.add(engine)
+
+
+def prepare_schema(engine: Engine) -> bool:
+    """`SCHEMA_MODE` に従ってスキーマを準備し、作成モードだったかを返す"""
+    if SCHEMA_MODE == "check":
+        check_schema(engine)
+        return False
+    if SCHEMA_MODE != "create":
+        raise ValueError(f"Unknown SCHEMA_MODE: {SCHEMA_MODE}")
+
+    from app.database import Base
+    from app.models import TableVersion
+    from app.search import ensure_search_index
+    from app.versions import CATEGORIES, GROUPS, ITEMS, LEADERS, SCOUTS
+
+    Base.metadata.create_all(bind=engine)
+    ensure_search_index(engine)
+    with engine.begin() as conn:
+        existing = set(conn.scalars(select(TableVersion.name)))
+        missing = [name for name in (CATEGORIES, GROUPS, ITEMS, LEADERS, SCOUTS) if name not in existing]
+        if missing:
+            conn.execute(insert(TableVersion), [{"name": name, "version": 0} for name in missing])
+    return True
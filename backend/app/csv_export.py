@@ -0,0 +1,93 @@
+"""一覧の CSV エクスポート
+
+列の並びは CSV 取り込み API が受け付ける形式と同じにしてあり、
+エクスポートしたファイルをそのまま再取り込みできる。
+
+行はサーバーサイドカーソル（`yield_per`）で少しずつ取得し、
+`EXPORT_BATCH_SIZE` 行ごとに書き出すため、件数によらずメモリ使用量は一定。
+"""
+import csv
+import io
+from typing import Callable, Iterator
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+from app.models import Item, Leader, Scout
+from app.serialization import ITEM_CATEGORY, join_item_category
+
+EXPORT_BATCH_SIZE = 1000
+
+ITEM_CSV_COLUMNS = [
+    "name", "category", "status", "quantity", "bring_to_jamboree",
+    "location", "owner_group_id", "note",
+]
+SCOUT_CSV_COLUMNS = ["name", "name_kana", "group_id", "grade", "rank", "gender", "patrol"]
+LEADER_CSV_COLUMNS = ["name", "group_id", "role", "gender", "phone", "email"]
+
+
+def _format(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _iter_csv(
+    session_factory: Callable[[], Session],
+    statement: Select,
+    columns: list[str],
+) -> Iterator[str]:
+    # レスポンス送信中もセッションを使うため、リクエストの依存関係とは別に開く
+    db = session_factory()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    try:
+        # Excel で文字化けしないよう BOM を付ける（取り込み側は utf-8-sig で読む）
+        buffer.write("\ufeff")
+        writer.writerow(columns)
+        result = db.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for rows in result.partitions():
+            writer.writerows([_format(value) for value in row] for row in rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+        if buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        db.close()
+
+
+def csv_response(
+    session_factory: Callable[[], Session],
+    statement: Select,
+    columns: list[str],
+    filename: str,
+) -> StreamingResponse:
+    return StreamingResponse(
+        _iter_csv(session_factory, statement, columns),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def item_export_statement() -> Select:
+    # カテゴリは名前で出力する（取り込み側も名前で受け付ける）
+    columns = [ITEM_CATEGORY if name == "category" else getattr(Item, name) for name in ITEM_CSV_COLUMNS]
+    return join_item_category(select(*columns).select_from(Item)).order_by(Item.id)
+
+
+def scout_export_statement(include_deleted: bool) -> Select:
+    statement = select(*(getattr(Scout, name) for name in SCOUT_CSV_COLUMNS)).order_by(Scout.id)
+    if not include_deleted:
+        statement = statement.where(Scout.is_deleted == False)
+    return statement
+
+
+def leader_export_statement(include_deleted: bool) -> Select:
+    statement = select(*(getattr(Leader, name) for name in LEADER_CSV_COLUMNS)).order_by(Leader.id)
+    if not include_deleted:
+        statement = statement.where(Leader.is_deleted == False)
+    return statement
@@ -1,8 +1,13 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from dotenv import load_dotenv
+from fastapi import Header
+from typing import Optional
+
+from app.admin import is_admin
 
 # .envファイルを読み込む
 load_dotenv()
@@ -13,23 +18,157 @@ SQLALCHEMY_DATABASE_URL = os.getenv(
     "sqlite:///./jumbory.db"
 )
 
-# SQLiteの場合は特別な設定が必要
-if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+# 接続プールなどの設定は実行環境ごとのプロファイルで切り替える（DATABASE_PROFILE）
+# - server: 常駐プロセス（uvicorn）向け。複数スレッドから使うため大きめのプール
+# - lambda: 1 コンテナ 1 リクエストなので最小限のプール。フリーズ明けに切れた接続を
+#   pre-ping で検出し、アイドル接続を早めに作り直す
+# - sqlite-local: 開発用 SQLite。WAL で読み取りが書き込みを待たないようにする
+ENGINE_PROFILES = {
+    "server": {
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+    },
+    "lambda": {
+        "pool_size": 1,
+        "max_overflow": 2,
+        "pool_timeout": 10,
+        "pool_recycle": 300,
+        "pool_pre_ping": True,
+    },
+    "sqlite-local": {
+        "connect_args": {"check_same_thread": False},
+    },
+}
+
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    # 負の値は KiB 単位（約 20MB）
+    "cache_size": -20000,
+    "busy_timeout": 5000,
+    "temp_store": "MEMORY",
+}
+
+
+def _default_profile(url: str) -> str:
+    if url.startswith("sqlite"):
+        return "sqlite-local"
+    if os.getenv("AWS_LAMBDA_FUNCTION_NAME"):
+        return "lambda"
+    return "server"
+
+
+DATABASE_PROFILE = os.getenv("DATABASE_PROFILE", _default_profile(SQLALCHEMY_DATABASE_URL))
+if DATABASE_PROFILE not in ENGINE_PROFILES:
+    raise ValueError(f"Unknown DATABASE_PROFILE: {DATABASE_PROFILE}")
+
+
+def engine_options(profile: str, url: str) -> dict:
+    options = dict(ENGINE_PROFILES[profile])
+    if url.startswith("sqlite"):
+        # SQLiteの場合は特別な設定が必要
+        options.setdefault("connect_args", {"check_same_thread": False})
+    # プロファイルの値は環境変数で個別に上書きできる
+    for key, env in (
+        ("pool_size", "DB_POOL_SIZE"),
+        ("max_overflow", "DB_MAX_OVERFLOW"),
+        ("pool_timeout", "DB_POOL_TIMEOUT"),
+        ("pool_recycle", "DB_POOL_RECYCLE"),
+    ):
+        if key in options and os.getenv(env):
+            options[key] = int(os.environ[env])
+    return options
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, **engine_options(DATABASE_PROFILE, SQLALCHEMY_DATABASE_URL)
+)
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", set_sqlite_pragmas)
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# 参照系 API はリードレプリカ（DATABASE_READ_URL）があればそちらに送る
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL", "")
+if DATABASE_READ_URL:
+    read_engine = create_engine(
+        DATABASE_READ_URL, **engine_options(DATABASE_PROFILE, DATABASE_READ_URL)
     )
+    if read_engine.dialect.name == "sqlite":
+        event.listen(read_engine, "connect", set_sqlite_pragmas)
 else:
-    # PostgreSQLの場合
-    engine = create_engine(SQLALCHEMY_DATABASE_URL)
+    read_engine = engine
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 Base = declarative_base()
 
 
+def _pool_counters(pool) -> dict:
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            timeout=pool.timeout(),
+        )
+    return status
+
+
+def pool_status() -> dict:
+    """接続プールの現在の状態（診断用）"""
+    status = {
+        "profile": DATABASE_PROFILE,
+        "dialect": engine.dialect.name,
+        "write": _pool_counters(engine.pool),
+    }
+    if read_engine is not engine:
+        status["read"] = _pool_counters(read_engine.pool)
+    return status
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def reads_from_primary(x_read_primary: Optional[str], x_admin_password: Optional[str]) -> bool:
+    """`X-Read-Primary: 1` は管理者（`X-Admin-Password` が正しい）の場合だけ受け付ける
+
+    誰でもプライマリに読み込みを向けられるとレプリカで負荷を逃がす意味がなくなるため、
+    それ以外はヘッダーがあってもレプリカから読む。
+    """
+    return x_read_primary == "1" and is_admin(x_admin_password)
+
+
+def get_read_db(
+    x_read_primary: Optional[str] = Header(None, alias="X-Read-Primary"),
+    x_admin_password: Optional[str] = Header(None, alias="X-Admin-Password"),
+):
+    """参照用のセッション（レプリカが無ければ書き込み用と同じ DB）
+
+    レプリカは更新の反映が遅れることがあるため、更新直後の管理画面など
+    自分の書き込みを確実に読みたいときは `X-Read-Primary: 1` を付けてプライマリから読む。
+    """
+    primary = reads_from_primary(x_read_primary, x_admin_password)
+    factory = SessionLocal if primary else ReadSessionLocal
+    db = factory()
+    try:
+        yield db
+    finally:
+        db.close()
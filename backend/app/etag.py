@@ -0,0 +1,44 @@
+"""テーブルバージョンに基づく ETag / If-None-Match 対応
+
+一覧レスポンスの内容は「参照するテーブルのバージョン」と「クエリパラメータ」で
+決まるため、この 2 つから強い ETag を作る。`If-None-Match` が一致すれば
+ORM でのクエリもレスポンスのシリアライズも行わずに 304 を返す。
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+from sqlalchemy.orm import Session
+
+from app.versions import get_versions
+
+
+def build_etag(request: Request, versions: dict[str, int]) -> str:
+    params = sorted(request.query_params.multi_items())
+    source = repr((request.url.path, params, sorted(versions.items())))
+    return '"' + hashlib.sha256(source.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def conditional_get(
+    request: Request,
+    response: Response,
+    db: Session,
+    tables: tuple[str, ...],
+) -> Optional[Response]:
+    """ETag を設定し、クライアントのキャッシュが最新なら 304 レスポンスを返す
+
+    None が返った場合は通常どおり本体を生成する。
+    """
+    etag = build_etag(request, get_versions(db, tables))
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
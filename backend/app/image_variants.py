@@ -0,0 +1,67 @@
+"""備品画像の縮小版（WebP）生成
+
+一覧表示用のサムネイルとプレビュー用の中サイズを WebP で作る。
+リサイズは CPU を使うため、API ワーカーとは別のプロセスプールで実行する。
+プロセスプールを作れない環境（/dev/shm の無い AWS Lambda など）では
+スレッドプールで代用する（Pillow はリサイズ中に GIL を解放する）。
+"""
+import asyncio
+import io
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# 名前: 長辺の最大ピクセル数
+IMAGE_VARIANTS = {
+    "thumb": 200,
+    "medium": 800,
+}
+WEBP_QUALITY = 80
+IMAGE_VARIANT_WORKERS = int(os.getenv("IMAGE_VARIANT_WORKERS", "2"))
+
+_executor: Optional[Executor] = None
+
+
+def make_variants(data: bytes) -> dict[str, bytes]:
+    """元画像から各サイズの WebP を作る（プロセスプールで実行されるためトップレベルに置く）"""
+    from PIL import Image, ImageOps
+
+    variants: dict[str, bytes] = {}
+    with Image.open(io.BytesIO(data)) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        for name, max_size in IMAGE_VARIANTS.items():
+            resized = image.copy()
+            resized.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            resized.save(buffer, format="WEBP", quality=WEBP_QUALITY, method=4)
+            variants[name] = buffer.getvalue()
+    return variants
+
+
+def _get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        try:
+            _executor = ProcessPoolExecutor(max_workers=IMAGE_VARIANT_WORKERS)
+        except (OSError, NotImplementedError):
+            logger.warning("Process pool is unavailable; generating image variants in threads")
+            _executor = ThreadPoolExecutor(max_workers=IMAGE_VARIANT_WORKERS)
+    return _executor
+
+
+async def generate_variants(data: bytes) -> dict[str, bytes]:
+    """イベントループを止めずに縮小版を生成する"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), make_variants, data)
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
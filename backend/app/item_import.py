@@ -0,0 +1,124 @@
+"""備品 CSV の一括取り込み
+
+アップロードされたファイルを 1 行ずつ読み、全体をメモリに載せずに処理する。
+
+1. 1 パス目でカテゴリ名と所有団 ID だけを集め、まとめて解決する
+   （カテゴリは 1 回のクエリで照合して未登録分を複数行 INSERT、所有団はマスタキャッシュで確認）
+2. 2 パス目で行を検証し、`IMPORT_BATCH_SIZE` 件ごとに複数行 INSERT してコミットする
+
+ORM オブジェクトを作らないため、セッションの identity map も膨らまない。
+"""
+import csv
+import io
+from typing import BinaryIO, Iterator
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.master_cache import existing_group_ids
+from app.models import Category, Item
+from app.normalize import normalize_search_key
+from app.versions import CATEGORIES, ITEMS, bump_version
+
+IMPORT_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 100
+TRUE_VALUES = {"1", "true", "yes", "○"}
+
+
+def _iter_rows(file: BinaryIO) -> Iterator[tuple[int, dict]]:
+    file.seek(0)
+    stream = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        # ヘッダーを1行目とする
+        yield from enumerate(csv.DictReader(stream), start=2)
+    finally:
+        stream.detach()
+
+
+def _cell(row: dict, key: str, default: str = "") -> str:
+    return (row.get(key) or default).strip()
+
+
+def _resolve_masters(db: Session, file: BinaryIO) -> tuple[dict[str, int], set[int]]:
+    """カテゴリを登録し、カテゴリ名 → ID と存在する所有団 ID の集合を返す"""
+    category_names: set[str] = set()
+    group_ids: set[int] = set()
+    for _, row in _iter_rows(file):
+        category_name = _cell(row, "category")
+        if category_name:
+            category_names.add(category_name)
+        try:
+            group_ids.add(int(_cell(row, "owner_group_id")))
+        except ValueError:
+            pass
+
+    category_ids: dict[str, int] = {}
+    if category_names:
+        statement = select(Category.name, Category.id).where(Category.name.in_(category_names))
+        category_ids = dict(db.execute(statement).all())
+        missing = sorted(category_names - category_ids.keys())
+        if missing:
+            category_ids.update(db.execute(
+                insert(Category).returning(Category.name, Category.id),
+                [{"name": name, "sort_order": 0, "is_active": True} for name in missing],
+            ).all())
+            bump_version(db, CATEGORIES)
+            db.commit()
+
+    return category_ids, existing_group_ids(db, group_ids)
+
+
+def _build_item(row: dict, category_ids: dict[str, int], valid_group_ids: set[int]) -> dict:
+    owner_group_id = int(_cell(row, "owner_group_id"))
+    if owner_group_id not in valid_group_ids:
+        raise ValueError(f"owner_group_id {owner_group_id} は存在しません")
+
+    name = _cell(row, "name")
+    if not name:
+        raise ValueError("name は必須です")
+
+    return {
+        "name": name,
+        "name_key": normalize_search_key(name),
+        "category_id": category_ids.get(_cell(row, "category")),
+        "status": _cell(row, "status", "保管中"),
+        "quantity": int(_cell(row, "quantity") or "1"),
+        "bring_to_jamboree": _cell(row, "bring_to_jamboree").lower() in TRUE_VALUES,
+        "location": _cell(row, "location"),
+        "owner_group_id": owner_group_id,
+        "note": _cell(row, "note") or None,
+    }
+
+
+def import_items_csv(db: Session, file: BinaryIO) -> dict:
+    """CSV を取り込み、登録件数と行単位のエラーを返す"""
+    category_ids, valid_group_ids = _resolve_masters(db, file)
+
+    created = 0
+    failed = 0
+    errors: list[str] = []
+    batch: list[dict] = []
+
+    def flush() -> None:
+        nonlocal created
+        if not batch:
+            return
+        db.execute(insert(Item), batch)
+        bump_version(db, ITEMS)
+        db.commit()
+        created += len(batch)
+        batch.clear()
+
+    for row_num, row in _iter_rows(file):
+        try:
+            batch.append(_build_item(row, category_ids, valid_group_ids))
+        except Exception as e:
+            failed += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append(f"行 {row_num}: {str(e)}")
+            continue
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            flush()
+    flush()
+
+    return {"created": created, "failed": failed, "errors": errors}
@@ -0,0 +1,21 @@
+"""備品詳細で使うリレーションのロード戦略
+
+`Item` スキーマは `group` / `approved_leader` / `responsible_scout` を
+ネストして返すため、遅延ロードのままだと参照のたびに追加の SELECT が走る。
+詳細エンドポイントはここで定義したオプションを `query.options(...)` に渡す。
+一覧は ORM を使わず列のタプルで読み、リレーションは `app/serialization.py` で
+リレーションごとに IN 句 1 回で取得する。
+"""
+from sqlalchemy.orm import joinedload
+
+from app.models import Item
+
+
+def item_detail_options() -> tuple:
+    """詳細用: 1 行だけなので LEFT OUTER JOIN で 1 クエリにまとめる"""
+    return (
+        joinedload(Item.group),
+        joinedload(Item.category_ref),
+        joinedload(Item.approved_leader),
+        joinedload(Item.responsible_scout),
+    )
@@ -0,0 +1,118 @@
+"""カテゴリ・団マスタのプロセス内キャッシュ
+
+マスタはシーズン中にほとんど変わらないため、一覧 API と外部キーの存在確認は
+メモリ上のデータで返す。自プロセスでの更新は `invalidate()` で即時に、
+他ワーカーでの更新は `table_versions` のバージョン比較で検知する
+（比較は `MASTER_CACHE_CHECK_SECONDS` 秒に 1 回まで）。
+
+キャッシュは最大で上記の秒数だけ古いため、存在確認はキャッシュに無いときだけ DB で確かめる。
+参照系はリードレプリカから読み込むこともあるので、既に知っているバージョンより
+古いデータ（反映が遅れたレプリカの内容）はキャッシュに保存しない。
+"""
+import os
+import threading
+import time
+from typing import Callable, Generic, Optional, TypeVar
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Category as CategoryModel, Group as GroupModel
+from app.schemas import Category, Group
+from app.versions import CATEGORIES, GROUPS, get_version, on_tables_committed
+
+MASTER_CACHE_CHECK_SECONDS = float(os.getenv("MASTER_CACHE_CHECK_SECONDS", "5"))
+
+T = TypeVar("T")
+
+
+class MasterDataCache(Generic[T]):
+    def __init__(
+        self,
+        table: str,
+        loader: Callable[[Session], list[T]],
+        check_seconds: float = MASTER_CACHE_CHECK_SECONDS,
+    ) -> None:
+        self.table = table
+        self.loader = loader
+        self.check_seconds = check_seconds
+        self._lock = threading.Lock()
+        self._data: Optional[list[T]] = None
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self._generation = 0
+        # 存在が分かっている最新のバージョン（これより古いデータは保存しない）
+        self._known_version = 0
+
+    def get(self, db: Session) -> list[T]:
+        # DB の読み込み中はロックを持たない。非同期セッション（run_sync）では
+        # 読み込み中に同じスレッドの別リクエストへ切り替わるため、持ったままだと詰まる
+        with self._lock:
+            if self._data is not None and time.monotonic() - self._checked_at < self.check_seconds:
+                return self._data
+            data, cached_version, generation = self._data, self._version, self._generation
+
+        version = get_version(db, self.table)
+        if data is None or version > cached_version:
+            data = self.loader(db)
+
+        with self._lock:
+            # 読み込み中に invalidate された場合や、遅れたレプリカから古い版を読んだ場合は保存しない
+            if generation == self._generation and version >= self._known_version:
+                self._data = data
+                self._version = version
+                self._known_version = version
+                self._checked_at = time.monotonic()
+        return data
+
+    def invalidate(self) -> None:
+        """自プロセスでのコミット後に呼ぶ（バージョンは少なくとも 1 つ上がっている）"""
+        with self._lock:
+            self._data = None
+            self._generation += 1
+            self._known_version += 1
+
+
+def _load_categories(db: Session) -> list[Category]:
+    rows = db.query(CategoryModel).order_by(
+        CategoryModel.sort_order.asc(), CategoryModel.name.asc()
+    )
+    return [Category.model_validate(row) for row in rows]
+
+
+def _load_groups(db: Session) -> list[Group]:
+    rows = db.query(GroupModel).order_by(GroupModel.id.asc())
+    return [Group.model_validate(row) for row in rows]
+
+
+category_cache: MasterDataCache[Category] = MasterDataCache(CATEGORIES, _load_categories)
+group_cache: MasterDataCache[Group] = MasterDataCache(GROUPS, _load_groups)
+
+_caches = {cache.table: cache for cache in (category_cache, group_cache)}
+
+
+def _invalidate_bumped(tables: set[str]) -> None:
+    for table in tables:
+        cache = _caches.get(table)
+        if cache is not None:
+            cache.invalidate()
+
+
+on_tables_committed(_invalidate_bumped)
+
+
+def category_id_by_name(db: Session, name: str) -> Optional[int]:
+    return next((category.id for category in category_cache.get(db) if category.name == name), None)
+
+
+def existing_group_ids(db: Session, group_ids: set[int]) -> set[int]:
+    """存在する団 ID を返す（キャッシュに無い ID だけ DB で確認する）"""
+    found = group_ids & {group.id for group in group_cache.get(db)}
+    missing = group_ids - found
+    if missing:
+        found |= set(db.scalars(select(GroupModel.id).where(GroupModel.id.in_(missing))))
+    return found
+
+
+def group_exists(db: Session, group_id: int) -> bool:
+    return bool(existing_group_ids(db, {group_id}))
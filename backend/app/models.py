@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, Index
+from sqlalchemy.orm import relationship, validates
 from app.database import Base
+from app.normalize import normalize_search_key
 
 
 class Category(Base):
@@ -28,6 +29,7 @@ class Leader(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, index=True)
+    name_key = Column(String, nullable=True, index=True)  # 正規化済み検索キー
     group_id = Column(Integer, ForeignKey("groups.id"), nullable=False)
     role = Column(String, nullable=True)
     gender = Column(String, nullable=True)
@@ -39,6 +41,20 @@ class Leader(Base):
     group = relationship("Group")
     approved_items = relationship("Item", back_populates="approved_leader")
 
+    # 一覧（未削除のみ、id 順 / 名前順のキーセットページネーション）
+    __table_args__ = (
+        Index("ix_leaders_is_deleted_id", "is_deleted", "id"),
+        Index(
+            "ix_leaders_active_name", "name", "id",
+            sqlite_where=is_deleted == False, postgresql_where=is_deleted == False,
+        ),
+    )
+
+    @validates("name")
+    def _update_name_key(self, key, value):
+        self.name_key = normalize_search_key(value)
+        return value
+
 
 class Scout(Base):
     __tablename__ = "scouts"
@@ -46,6 +62,8 @@ class Scout(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, index=True)
     name_kana = Column(String, nullable=True)  # ふりがな
+    name_key = Column(String, nullable=True, index=True)  # 正規化済み検索キー
+    name_kana_key = Column(String, nullable=True, index=True)  # 正規化済み検索キー（ふりがな）
     group_id = Column(Integer, ForeignKey("groups.id"), nullable=False)
     grade = Column(String, nullable=True)  # 学年
     rank = Column(String, nullable=True)  # 級（カブ、ボーイ等の進級）
@@ -57,13 +75,28 @@ class Scout(Base):
     group = relationship("Group")
     responsible_items = relationship("Item", back_populates="responsible_scout")
 
+    # 一覧（未削除のみ、id 順 / 名前順のキーセットページネーション）
+    __table_args__ = (
+        Index("ix_scouts_is_deleted_id", "is_deleted", "id"),
+        Index(
+            "ix_scouts_active_name", "name", "id",
+            sqlite_where=is_deleted == False, postgresql_where=is_deleted == False,
+        ),
+    )
+
+    @validates("name", "name_kana")
+    def _update_search_keys(self, key, value):
+        setattr(self, f"{key}_key", normalize_search_key(value))
+        return value
+
 
 class Item(Base):
     __tablename__ = "items"
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, index=True)
-    category = Column(String, nullable=False)
+    name_key = Column(String, nullable=True, index=True)  # 正規化済み検索キー
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)  # カテゴリID（未設定は NULL）
     status = Column(String, nullable=False)  # 保管中/貸出中/要メンテ
     quantity = Column(Integer, nullable=False, default=1)
     bring_to_jamboree = Column(Boolean, nullable=False, default=False)
@@ -72,9 +105,56 @@ class Item(Base):
     approved_leader_id = Column(Integer, ForeignKey("leaders.id"), nullable=True)  # 承認指導者ID
     responsible_scout_id = Column(Integer, ForeignKey("scouts.id"), nullable=True)  # 使用責任スカウトID
     image_url = Column(String, nullable=True)
+    thumbnail_url = Column(String, nullable=True)  # 一覧用サムネイル（WebP）
+    medium_image_url = Column(String, nullable=True)  # プレビュー用中サイズ（WebP）
     note = Column(String, nullable=True)
     
     # リレーション
     group = relationship("Group", back_populates="items")
+    category_ref = relationship("Category")
     approved_leader = relationship("Leader", back_populates="approved_items")
     responsible_scout = relationship("Scout", back_populates="responsible_items")
+
+    __table_args__ = (
+        # 一覧のステータス絞り込み（id 順 / 名前順）
+        Index("ix_items_status_id", "status", "id"),
+        Index("ix_items_status_name", "status", "name", "id"),
+        # 一括更新の条件・集計
+        Index("ix_items_owner_group_id", "owner_group_id"),
+        Index("ix_items_category_id", "category_id"),
+        # ジャンボリー持参品リスト（持参フラグ付きの行だけ）
+        Index(
+            "ix_items_jamboree", "owner_group_id", "category_id", "location",
+            sqlite_where=bring_to_jamboree == True, postgresql_where=bring_to_jamboree == True,
+        ),
+    )
+
+    @property
+    def category(self) -> str:
+        """カテゴリ名（API・CSV ではカテゴリを名前で受け渡す）"""
+        return self.category_ref.name if self.category_ref is not None else ""
+
+    @validates("name")
+    def _update_name_key(self, key, value):
+        self.name_key = normalize_search_key(value)
+        return value
+
+
+class TableVersion(Base):
+    """テーブルごとの変更バージョン（キャッシュ無効化用）"""
+    __tablename__ = "table_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class StorageDeletion(Base):
+    """ストレージから削除待ちの画像（バックグラウンドでまとめて削除する）"""
+    __tablename__ = "storage_deletions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    path = Column(String, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False, index=True)  # UTC
+    last_error = Column(String, nullable=True)
+    claimed_at = Column(DateTime, nullable=True)  # UTC。ワーカーが処理中の間だけ入る（リース）
@@ -0,0 +1,25 @@
+"""検索キーの正規化
+
+ひらがな/カタカナ、全角/半角、大文字/小文字の表記ゆれを吸収するため、
+名前列には正規化済みの検索キー列（`*_key`）を持たせて書き込み時に更新する。
+"""
+import re
+import unicodedata
+from typing import Optional
+
+# カタカナ（ァ〜ヶ）をひらがな（ぁ〜ゖ）へ
+_KATAKANA_TO_HIRAGANA = {code: code - 0x60 for code in range(0x30A1, 0x30F7)}
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_search_key(value: Optional[str]) -> Optional[str]:
+    """NFKC 正規化 → 大文字小文字の畳み込み → カタカナをひらがなへ → 空白除去
+
+    >>> normalize_search_key("ﾃﾝﾄ（ＬＥＤ）")
+    'てんと(led)'
+    """
+    if value is None:
+        return None
+    key = unicodedata.normalize("NFKC", value).casefold()
+    key = key.translate(_KATAKANA_TO_HIRAGANA)
+    return _WHITESPACE.sub("", key)
@@ -0,0 +1,49 @@
+"""ジャンボリーの持参品リスト
+
+持参フラグ（`bring_to_jamboree`）の付いた備品を所有団・カテゴリ・保管場所・
+使用責任スカウト・承認指導者ごとにまとめ、件数・数量の合計と備品名を
+1 回の GROUP BY で集計する。JSON と CSV で同じ文を使う。
+
+持参フラグ付きの行だけを含む部分インデックス `ix_items_jamboree` で引く。
+"""
+from sqlalchemy import Select, func, select
+
+from app.models import Category, Group, Item, Leader, Scout
+from app.serialization import ITEM_CATEGORY, join_item_category
+
+PACKING_LIST_COLUMNS = [
+    "group_id", "group_name", "category", "location",
+    "responsible_scout", "approved_leader", "item_count", "quantity", "item_names",
+]
+
+# 備品名の区切り（CSV でもセル内に収まるようカンマは使わない）
+ITEM_NAME_SEPARATOR = " / "
+
+
+def packing_list_statement() -> Select:
+    statement = (
+        select(
+            Item.owner_group_id.label("group_id"),
+            Group.name.label("group_name"),
+            ITEM_CATEGORY,
+            Item.location,
+            Scout.name.label("responsible_scout"),
+            Leader.name.label("approved_leader"),
+            func.count(Item.id).label("item_count"),
+            func.sum(Item.quantity).label("quantity"),
+            func.aggregate_strings(Item.name, ITEM_NAME_SEPARATOR).label("item_names"),
+        )
+        .select_from(Item)
+        .join(Group, Group.id == Item.owner_group_id)
+        .outerjoin(Scout, Scout.id == Item.responsible_scout_id)
+        .outerjoin(Leader, Leader.id == Item.approved_leader_id)
+        .where(Item.bring_to_jamboree == True)
+    )
+    return (
+        join_item_category(statement)
+        .group_by(
+            Item.owner_group_id, Group.name, Item.category_id, Category.name, Item.location,
+            Item.responsible_scout_id, Scout.name, Item.approved_leader_id, Leader.name,
+        )
+        .order_by(Item.owner_group_id, ITEM_CATEGORY, Item.location, Scout.name, Leader.name)
+    )
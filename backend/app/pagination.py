@@ -0,0 +1,98 @@
+"""一覧エンドポイント用のキーセット（カーソル）ページネーション
+
+`(ソートキー, id)` の順で並べ、前ページ最後の行より後ろを WHERE 条件で取得する。
+OFFSET を使わないため、何ページ目でもインデックスの範囲走査だけで済む。
+
+レスポンス本体は従来どおり配列のままとし、次ページのカーソルは
+`X-Next-Cursor` ヘッダーで返す（最終ページでは付与しない）。
+"""
+import base64
+import binascii
+import json
+from typing import Any, Optional
+
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(sort: str, values: list[Any]) -> str:
+    payload = json.dumps({"s": sort, "v": values}, ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(sort: str, cursor: str) -> list[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = payload["v"]
+        if payload["s"] != sort or not isinstance(values, list):
+            raise ValueError
+        return values
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _valid_cursor_values(values: list[Any], column_count: int) -> bool:
+    """カーソルの値が `[id]` または `[ソートキー（文字列）, id]` の形かを確認する
+
+    ソートキーはいずれも文字列の列のため、型が違う値は DB に渡す前に弾く。
+    """
+    if len(values) != column_count:
+        return False
+    *keys, row_id = values
+    if not isinstance(row_id, int) or isinstance(row_id, bool):
+        return False
+    return all(isinstance(key, str) for key in keys)
+
+
+def paginate(
+    query: Query,
+    model,
+    sort: str,
+    limit: Optional[int],
+    cursor: Optional[str],
+    response: Response,
+) -> list:
+    """`(sort, id)` 順のキーセットページネーションを適用して結果を返す
+
+    `limit` 未指定なら従来どおり全件を返す。
+    """
+    id_column = model.id
+    if sort == "id":
+        columns = [id_column]
+    else:
+        columns = [getattr(model, sort), id_column]
+
+    query = query.order_by(*(column.asc() for column in columns))
+
+    if cursor:
+        values = decode_cursor(sort, cursor)
+        if not _valid_cursor_values(values, len(columns)):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if len(columns) == 1:
+            query = query.filter(id_column > values[0])
+        else:
+            sort_column = columns[0]
+            query = query.filter(
+                or_(
+                    sort_column > values[0],
+                    and_(sort_column == values[0], id_column > values[1]),
+                )
+            )
+
+    if limit is None:
+        return query.all()
+
+    # 1 件多く取得して次ページの有無を判定する
+    rows = query.limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            sort, [getattr(last, column.key) for column in columns]
+        )
+    return rows
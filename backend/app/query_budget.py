@@ -0,0 +1,126 @@
+"""リクエスト単位の SQL クエリ数計測とクエリ予算チェック
+
+エンドポイントに `@query_budget(n)` で 1 リクエストあたりの上限を宣言し、
+`QueryBudgetMiddleware` が実際に発行された SQL 文の数と比較する。
+
+動作モードは環境変数 `SQL_QUERY_BUDGET_MODE` で切り替える。
+- `off`: 計測しない
+- `warn`: 予算超過をログに出す（デフォルト）
+- `strict`: 予算超過を `QueryBudgetExceeded` として 500 にする（開発・CI 用）
+"""
+import logging
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+QUERY_BUDGET_MODE = os.getenv("SQL_QUERY_BUDGET_MODE", "warn")
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """宣言したクエリ予算をエンドポイントが超えた"""
+
+
+class QueryCounter:
+    def __init__(self) -> None:
+        self.count = 0
+        self.statements: list[str] = []
+
+
+_current_counter: ContextVar[Optional[QueryCounter]] = ContextVar(
+    "sql_query_counter", default=None
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = _current_counter.get()
+    if counter is not None:
+        counter.count += 1
+        counter.statements.append(statement)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """ブロック内（同じコンテキスト）で発行された SQL 文を数える
+
+    with count_queries() as counter:
+        get_items(search=None, status=None, db=db)
+    assert counter.count <= 4
+    """
+    counter = QueryCounter()
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
+
+
+@contextmanager
+def uncounted() -> Iterator[None]:
+    """ブロック内の SQL 文を予算の計測から外す（回数が状況で変わる待ち合わせ用）"""
+    token = _current_counter.set(None)
+    try:
+        yield
+    finally:
+        _current_counter.reset(token)
+
+
+def query_budget(limit: int) -> Callable:
+    """エンドポイントが 1 リクエストで発行してよい SQL 文の上限を宣言する"""
+
+    def decorator(func: Callable) -> Callable:
+        func.__query_budget__ = limit
+        return func
+
+    return decorator
+
+
+class QueryBudgetMiddleware:
+    """リクエストごとに SQL 文を数え、宣言された予算と比較する ASGI ミドルウェア
+
+    同期エンドポイントはスレッドプールで実行されるが、contextvars は
+    スレッドにコピーされるため同じカウンタに加算される。
+    """
+
+    def __init__(self, app, mode: str = QUERY_BUDGET_MODE) -> None:
+        self.app = app
+        self.mode = mode
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.mode == "off":
+            await self.app(scope, receive, send)
+            return
+
+        counter = QueryCounter()
+        token = _current_counter.set(counter)
+
+        async def send_with_check(message):
+            # レスポンス開始時点でエンドポイントとシリアライズは完了している
+            if message["type"] == "http.response.start":
+                self._check(scope, counter)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_check)
+        finally:
+            _current_counter.reset(token)
+
+    def _check(self, scope, counter: QueryCounter) -> None:
+        endpoint = scope.get("endpoint")
+        limit = getattr(endpoint, "__query_budget__", None)
+        if limit is None or counter.count <= limit:
+            return
+
+        message = (
+            f"{scope['method']} {scope['path']} issued {counter.count} SQL statements "
+            f"(budget {limit})"
+        )
+        if self.mode == "strict":
+            raise QueryBudgetExceeded(message + ":\n" + "\n".join(counter.statements))
+        logger.warning(message)
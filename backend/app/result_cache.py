@@ -0,0 +1,104 @@
+"""一覧レスポンスの結果キャッシュ
+
+公開ページの備品一覧は同じ検索条件で何度も呼ばれるため、シリアライズ済みの
+レスポンス本体（JSON のバイト列）をプロセス内に保持して、クエリと
+シリアライズを省略する。
+
+キーは ETag（パス・並べ替えたクエリパラメータ・参照テーブルのバージョンのハッシュ、
+app/etag.py）をそのまま使う。他のワーカーでの更新もバージョンが変わるため
+古い結果は参照されない。自プロセスでの更新はコミット直後に全件を破棄し、メモリを早めに空ける。
+
+- 件数（`max_entries`）と合計バイト数（`max_bytes`）の上限を超えたら古い順に追い出す（LRU）
+- `ttl_seconds` を過ぎたエントリは使わない
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app.versions import on_tables_committed
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    headers: dict[str, str]
+    stored_at: float = field(default_factory=time.monotonic)
+
+
+class ResultCache:
+    def __init__(
+        self,
+        tables: tuple[str, ...],
+        max_entries: int,
+        max_bytes: int,
+        ttl_seconds: float,
+    ) -> None:
+        self.tables = set(tables)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        on_tables_committed(self._on_commit)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry.stored_at < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def put(self, key: str, body: bytes, headers: dict[str, str]) -> None:
+        # 1 件で上限の 1/4 を超える大きな結果は保持しない
+        if len(body) > self.max_bytes // 4:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = CachedResponse(body, headers)
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _remove(self, key: str) -> None:
+        self._bytes -= len(self._entries.pop(key).body)
+
+    def _on_commit(self, tables: set[str]) -> None:
+        if tables & self.tables:
+            self.clear()
+
+
+ITEM_CACHE_MAX_ENTRIES = int(os.getenv("ITEM_CACHE_MAX_ENTRIES", "256"))
+ITEM_CACHE_MAX_BYTES = int(os.getenv("ITEM_CACHE_MAX_MB", "32")) * 1024 * 1024
+ITEM_CACHE_TTL_SECONDS = float(os.getenv("ITEM_CACHE_TTL_SECONDS", "300"))
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, Union
 
 
 # Category schemas
@@ -13,6 +13,12 @@ class CategoryCreate(CategoryBase):
     pass
 
 
+class CategoryUpdate(BaseModel):
+    name: Optional[str] = None
+    sort_order: Optional[int] = None
+    is_active: Optional[bool] = None
+
+
 class Category(CategoryBase):
     id: int
 
@@ -45,6 +51,16 @@ class AdminAuthResponse(BaseModel):
     authenticated: bool
 
 
+# Bulk operation schemas
+class BulkIds(BaseModel):
+    ids: list[int]
+
+
+class BulkResult(BaseModel):
+    updated: list[int]
+    missing: list[int] = []
+
+
 # Leader schemas
 class LeaderBase(BaseModel):
     name: str
@@ -68,6 +84,10 @@ class LeaderUpdate(BaseModel):
     email: Optional[str] = None
 
 
+class LeaderBulkReassign(BulkIds):
+    group_id: int
+
+
 class Leader(LeaderBase):
     id: int
     is_deleted: bool
@@ -101,6 +121,11 @@ class ScoutUpdate(BaseModel):
     patrol: Optional[str] = None
 
 
+class ScoutBulkReassign(BulkIds):
+    group_id: Optional[int] = None
+    patrol: Optional[str] = None
+
+
 class Scout(ScoutBase):
     id: int
     is_deleted: bool
@@ -140,12 +165,76 @@ class ItemUpdate(BaseModel):
     note: Optional[str] = None
 
 
+# 一括更新では名前（検索キーの再計算が必要）は変更できない
+class ItemBulkChanges(BaseModel):
+    category: Optional[str] = None
+    status: Optional[str] = None
+    quantity: Optional[int] = None
+    bring_to_jamboree: Optional[bool] = None
+    location: Optional[str] = None
+    owner_group_id: Optional[int] = None
+    approved_leader_id: Optional[int] = None
+    responsible_scout_id: Optional[int] = None
+    note: Optional[str] = None
+
+
+class ItemBulkFilter(BaseModel):
+    category: Optional[str] = None
+    status: Optional[str] = None
+    bring_to_jamboree: Optional[bool] = None
+    location: Optional[str] = None
+    owner_group_id: Optional[int] = None
+
+
+class ItemBulkUpdate(BaseModel):
+    ids: Optional[list[int]] = None
+    filter: Optional[ItemBulkFilter] = None
+    changes: ItemBulkChanges
+
+
 class Item(ItemBase):
     id: int
     image_url: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    medium_image_url: Optional[str] = None
     group: Group
     approved_leader: Optional[Leader] = None
     responsible_scout: Optional[Scout] = None
 
     class Config:
         from_attributes = True
+
+
+# Item statistics schemas
+class ItemStatsBucket(BaseModel):
+    key: Union[bool, int, str]
+    count: int
+    quantity: int
+
+
+class ItemStats(BaseModel):
+    total_count: int
+    total_quantity: int
+    by_status: list[ItemStatsBucket]
+    by_owner_group: list[ItemStatsBucket]
+    by_category: list[ItemStatsBucket]
+    by_bring_to_jamboree: list[ItemStatsBucket]
+
+
+# Packing list schemas
+class PackingListLine(BaseModel):
+    group_id: int
+    group_name: str
+    category: str
+    location: str
+    responsible_scout: Optional[str] = None
+    approved_leader: Optional[str] = None
+    item_count: int
+    quantity: int
+    item_names: str
+
+
+class PackingList(BaseModel):
+    total_count: int
+    total_quantity: int
+    lines: list[PackingListLine]
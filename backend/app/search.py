@@ -0,0 +1,217 @@
+"""備品の全文検索
+
+対象列は `name` / カテゴリ名 / `location` / `note` と、表記ゆれを吸収した
+正規化キー `name_key`（`app/normalize.py`）。
+
+- SQLite: FTS5 の外部コンテンツテーブル `items_fts`（trigram トークナイザ）を
+  トリガーで `items` と同期し、`MATCH` + bm25 の `rank` で関連度順に並べる。
+  カテゴリ名はビュー `items_search` 経由で索引し、カテゴリ名の変更もトリガーで反映する。
+- PostgreSQL: 3 列を連結した式に pg_trgm の GIN インデックスを張り、
+  `ILIKE` をインデックス検索にして `similarity()` で関連度順に並べる。
+  カテゴリ名は名前が一致するカテゴリ ID での絞り込みを OR で加える。
+
+trigram は 3 文字未満の語を索引できないため、短い検索語は LIKE にフォールバックする。
+DDL は Alembic マイグレーション（c4d9e2a7b1f3, 5e3b8c1d7a20, b8d2f4a6c1e3）と同じ内容で、
+`create_all` で作った開発用 DB には起動時の `ensure_search_index` で適用する。
+"""
+import logging
+from typing import Optional
+
+from sqlalchemy import and_, func, inspect, literal_column, or_, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql import column, table
+
+from app.models import Category, Item
+from app.normalize import normalize_search_key
+
+logger = logging.getLogger(__name__)
+
+MIN_TRIGRAM_LENGTH = 3
+
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIEW IF NOT EXISTS items_search AS
+    SELECT items.id, items.name, coalesce(categories.name, '') AS category,
+           items.location, items.note, items.name_key
+    FROM items LEFT JOIN categories ON categories.id = items.category_id
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+        name, category, location, note, name_key,
+        content='items_search', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_ai AFTER INSERT ON items BEGIN
+        INSERT INTO items_fts(rowid, name, category, location, note, name_key)
+        VALUES (new.id, new.name,
+                coalesce((SELECT name FROM categories WHERE id = new.category_id), ''),
+                new.location, new.note, new.name_key);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_ad AFTER DELETE ON items BEGIN
+        INSERT INTO items_fts(items_fts, rowid, name, category, location, note, name_key)
+        VALUES ('delete', old.id, old.name,
+                coalesce((SELECT name FROM categories WHERE id = old.category_id), ''),
+                old.location, old.note, old.name_key);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_au
+    AFTER UPDATE OF name, category_id, location, note, name_key ON items BEGIN
+        INSERT INTO items_fts(items_fts, rowid, name, category, location, note, name_key)
+        VALUES ('delete', old.id, old.name,
+                coalesce((SELECT name FROM categories WHERE id = old.category_id), ''),
+                old.location, old.note, old.name_key);
+        INSERT INTO items_fts(rowid, name, category, location, note, name_key)
+        VALUES (new.id, new.name,
+                coalesce((SELECT name FROM categories WHERE id = new.category_id), ''),
+                new.location, new.note, new.name_key);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS items_fts_category_au
+    AFTER UPDATE OF name ON categories BEGIN
+        INSERT INTO items_fts(items_fts, rowid, name, category, location, note, name_key)
+        SELECT 'delete', id, name, old.name, location, note, name_key
+        FROM items WHERE category_id = old.id;
+        INSERT INTO items_fts(rowid, name, category, location, note, name_key)
+        SELECT id, name, new.name, location, note, name_key
+        FROM items WHERE category_id = new.id;
+    END
+    """,
+]
+
+SQLITE_SEARCH_DROP_DDL = [
+    "DROP TRIGGER IF EXISTS items_fts_category_au",
+    "DROP TRIGGER IF EXISTS items_fts_au",
+    "DROP TRIGGER IF EXISTS items_fts_ad",
+    "DROP TRIGGER IF EXISTS items_fts_ai",
+    "DROP TABLE IF EXISTS items_fts",
+    "DROP VIEW IF EXISTS items_search",
+]
+
+POSTGRES_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    CREATE INDEX IF NOT EXISTS ix_items_search_trgm ON items USING gin (
+        (name || ' ' || location || ' ' || coalesce(note, ''))
+        gin_trgm_ops
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_items_name_key_trgm ON items USING gin (name_key gin_trgm_ops)",
+]
+
+items_fts = table("items_fts", column("rowid"), column("rank"))
+
+# エンジンごとに FTS テーブルの有無をキャッシュする
+_fts_available: dict[str, bool] = {}
+
+
+def ensure_search_index(engine: Engine) -> None:
+    """検索インデックスを作成する（作成済みなら何もしない）"""
+    dialect = engine.dialect.name
+    if dialect == "sqlite":
+        try:
+            with engine.begin() as conn:
+                created = not inspect(conn).has_table("items_fts")
+                if not created and "items_search" not in inspect(conn).get_view_names():
+                    # 構成が古い FTS テーブル（items を直接参照）は作り直す
+                    for statement in SQLITE_SEARCH_DROP_DDL:
+                        conn.execute(text(statement))
+                    created = True
+                for statement in SQLITE_SEARCH_DDL:
+                    conn.execute(text(statement))
+                if created:
+                    conn.execute(text("INSERT INTO items_fts(items_fts) VALUES ('rebuild')"))
+        except OperationalError:
+            # FTS5 / trigram 非対応の SQLite ビルドでは LIKE 検索のまま動かす
+            logger.warning("SQLite FTS5 trigram is unavailable; falling back to LIKE search")
+            _fts_available[str(engine.url)] = False
+            return
+        _fts_available[str(engine.url)] = True
+    elif dialect == "postgresql":
+        with engine.begin() as conn:
+            for statement in POSTGRES_SEARCH_DDL:
+                conn.execute(text(statement))
+
+
+def _has_fts(db: Session) -> bool:
+    engine = db.get_bind()
+    key = str(engine.url)
+    if key not in _fts_available:
+        _fts_available[key] = inspect(engine).has_table("items_fts")
+    return _fts_available[key]
+
+
+def _postgres_document():
+    # インデックス式と完全に一致させる必要がある
+    return (
+        Item.name + literal_column("' '") + Item.location + literal_column("' '")
+        + func.coalesce(Item.note, literal_column("''"))
+    )
+
+
+def _category_match(name_condition):
+    """カテゴリ名の条件を、該当するカテゴリ ID での絞り込みにする"""
+    return Item.category_id.in_(select(Category.id).where(name_condition))
+
+
+def _like_filter(search: str, key: str):
+    pattern = f"%{search}%"
+    return or_(
+        Item.name.like(pattern),
+        _category_match(Category.name.like(pattern)),
+        Item.location.like(pattern),
+        Item.note.like(pattern),
+        Item.name_key.like(f"%{key}%"),
+    )
+
+
+def _fts_phrase(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
+
+def apply_item_search(db: Session, query: Query, search: str) -> tuple[Query, Optional[object]]:
+    """検索条件を適用し、(クエリ, 関連度の並び順式) を返す
+
+    関連度で並べられない場合（短い検索語など）は並び順式に None を返す。
+    """
+    dialect = db.get_bind().dialect.name
+    key = normalize_search_key(search)
+    searchable = min(len(search), len(key)) >= MIN_TRIGRAM_LENGTH
+
+    if dialect == "sqlite" and searchable and _has_fts(db):
+        match = f"{_fts_phrase(search)} OR name_key : {_fts_phrase(key)}"
+        query = query.join(items_fts, items_fts.c.rowid == Item.id).filter(
+            literal_column("items_fts").op("MATCH")(match)
+        )
+        return query, items_fts.c.rank.asc()
+
+    if dialect == "postgresql":
+        document = _postgres_document()
+        query = query.filter(
+            or_(
+                document.ilike(f"%{search}%"),
+                Item.name_key.like(f"%{key}%"),
+                _category_match(Category.name.ilike(f"%{search}%")),
+            )
+        )
+        if not searchable:
+            return query, None
+        return query, func.similarity(document, search).desc()
+
+    return query.filter(_like_filter(search, key)), None
+
+
+def key_prefix_filter(db: Session, column, search: str):
+    """正規化キー列の前方一致条件（B-tree インデックスで引ける形）を返す"""
+    key = normalize_search_key(search)
+    if db.get_bind().dialect.name == "sqlite":
+        # SQLite の LIKE は大文字小文字を無視するため索引を使えない。範囲検索にする
+        return and_(column >= key, column < key + "\U0010ffff")
+    escaped = key.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return column.like(escaped + "%", escape="\\")
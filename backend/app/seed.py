@@ -0,0 +1,193 @@
+"""初期データの投入
+
+起動時には実行しない（開発用の `SCHEMA_MODE=create` を除く）。
+新しい環境を用意したときに一度だけ実行する。
+
+    python -m app.seed
+"""
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import Category, Group, Item, Leader, Scout
+from app.versions import CATEGORIES, GROUPS, ITEMS, LEADERS, SCOUTS, bump_version
+
+
+def seed_initial_data(db: Session) -> bool:
+    """団が 1 件も無ければサンプルデータを投入し、投入したかを返す"""
+    # 既にデータがある場合はスキップ
+    if db.scalar(select(Group.id).limit(1)) is not None:
+        return False
+
+    # 団データを追加
+    groups = [
+        Group(name="春日部第９団", description="ボーイスカウト春日部第９団"),
+        Group(name="春日部第７団", description="ボーイスカウト春日部第７団"),
+        Group(name="久喜第１団", description="ボーイスカウト久喜第１団"),
+        Group(name="久喜第２１団", description="ボーイスカウト久喜第２１団"),
+        Group(name="蓮田第１団", description="ボーイスカウト蓮田第１団"),
+        Group(name="蓮田第３団", description="ボーイスカウト蓮田第３団"),
+        Group(name="加須第１団", description="ボーイスカウト加須第１団"),
+        Group(name="宮代第１団", description="ボーイスカウト宮代第１団"),
+        Group(name="共有", description="全団共有備品"),
+    ]
+    db.add_all(groups)
+    db.commit()
+    
+    # 指導者データを追加
+    leaders = [
+        Leader(name="田中太郎", group_id=1, role="団委員長", gender="男", phone="090-1234-5678", email="tanaka@example.com"),
+        Leader(name="鈴木花子", group_id=1, role="副長", gender="女", phone="090-2345-6789", email="suzuki@example.com"),
+        Leader(name="佐藤一郎", group_id=2, role="隊長", gender="男", phone="090-3456-7890", email="sato@example.com"),
+        Leader(name="山田美咲", group_id=3, role="副長", gender="女", phone="090-4567-8901", email="yamada@example.com"),
+    ]
+    db.add_all(leaders)
+    db.commit()
+    
+    # スカウトデータを追加
+    scouts = [
+        Scout(name="高橋健太", name_kana="たかはしけんた", group_id=1, grade="小6", rank="1級", gender="男", patrol="イーグル班"),
+        Scout(name="伊藤大輔", name_kana="いとうだいすけ", group_id=1, grade="小5", rank="2級", gender="男", patrol="タイガー班"),
+        Scout(name="渡辺翔太", name_kana="わたなべしょうた", group_id=2, grade="中1", rank="初級", gender="男", patrol="ビーバー班"),
+        Scout(name="中村陽菜", name_kana="なかむらひな", group_id=2, grade="中2", rank="1級", gender="女", patrol="パンダ班"),
+        Scout(name="小林蓮", name_kana="こばやしれん", group_id=3, grade="中3", rank="菊", gender="男", patrol="ドラゴン班"),
+    ]
+    db.add_all(scouts)
+    db.commit()
+    
+    # サンプルカテゴリを追加
+    default_categories = [
+        "テント",
+        "寝具",
+        "調理器具",
+        "照明器具",
+        "食品保管",
+        "家具",
+        "電源設備",
+        "医療・安全",
+        "通信機器",
+    ]
+    categories = [
+        Category(name=category_name, sort_order=index)
+        for index, category_name in enumerate(default_categories, start=1)
+    ]
+    db.add_all(categories)
+    db.commit()
+    category_ids = {category.name: category.id for category in categories}
+
+    # サンプル備品データを10件追加
+    sample_items = [
+        Item(
+            name="テント（6人用）",
+            category_id=category_ids["テント"],
+            status="保管中",
+            location="倉庫A-1",
+            owner_group_id=1,
+            approved_leader_id=1,
+            note="2024年購入、状態良好"
+        ),
+        Item(
+            name="寝袋（冬季用）",
+            category_id=category_ids["寝具"],
+            status="貸出中",
+            location="倉庫A-2",
+            owner_group_id=2,
+            approved_leader_id=3,
+            responsible_scout_id=3,
+            note="田中さんに貸出中（返却予定: 2026/2/20）"
+        ),
+        Item(
+            name="ガスコンロ（2口）",
+            category_id=category_ids["調理器具"],
+            status="要メンテ",
+            location="倉庫B-3",
+            owner_group_id=3,
+            approved_leader_id=4,
+            note="着火が不安定、点検必要"
+        ),
+        Item(
+            name="ランタン（LED）",
+            category_id=category_ids["照明器具"],
+            status="保管中",
+            location="倉庫C-1",
+            owner_group_id=1,
+            approved_leader_id=1,
+            responsible_scout_id=1,
+            note="予備の電池あり"
+        ),
+        Item(
+            name="クーラーボックス（50L）",
+            category_id=category_ids["食品保管"],
+            status="保管中",
+            location="倉庫A-3",
+            owner_group_id=4,
+            note="保冷剤も一緒に保管"
+        ),
+        Item(
+            name="折りたたみテーブル",
+            category_id=category_ids["家具"],
+            status="貸出中",
+            location="倉庫B-1",
+            owner_group_id=2,
+            approved_leader_id=3,
+            responsible_scout_id=4,
+            note="山田さんに貸出中（返却予定: 2026/2/25）"
+        ),
+        Item(
+            name="折りたたみチェア（10脚セット）",
+            category_id=category_ids["家具"],
+            status="保管中",
+            location="倉庫B-2",
+            owner_group_id=4,
+            approved_leader_id=2,
+            note="2脚に軽微な傷あり"
+        ),
+        Item(
+            name="ポータブル発電機",
+            category_id=category_ids["電源設備"],
+            status="要メンテ",
+            location="倉庫C-2",
+            owner_group_id=3,
+            approved_leader_id=4,
+            note="オイル交換が必要"
+        ),
+        Item(
+            name="救急箱（大）",
+            category_id=category_ids["医療・安全"],
+            status="保管中",
+            location="管理室",
+            owner_group_id=4,
+            approved_leader_id=1,
+            note="常備薬・消毒液補充済み"
+        ),
+        Item(
+            name="トランシーバー（5台セット）",
+            category_id=category_ids["通信機器"],
+            status="保管中",
+            location="倉庫C-3",
+            owner_group_id=1,
+            approved_leader_id=2,
+            responsible_scout_id=2,
+            note="充電器も完備"
+        ),
+    ]
+    
+    db.add_all(sample_items)
+
+    for name in (GROUPS, LEADERS, SCOUTS, CATEGORIES, ITEMS):
+        bump_version(db, name)
+    db.commit()
+    return True
+
+
+def main() -> None:
+    db = SessionLocal()
+    try:
+        seeded = seed_initial_data(db)
+    finally:
+        db.close()
+    print("initial data created" if seeded else "data already exists; nothing to do")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""一覧レスポンスの高速シリアライズ
+
+一覧 API は ORM オブジェクトを作らず、スキーマの項目に対応する列だけを
+タプル（`Row`）で取得し、dict に詰めて `pydantic_core.to_json` で直接 JSON にする。
+DB から読んだ値は型が決まっているため、pydantic モデルでの再検証は省略する。
+
+出力はスキーマ（`app/schemas.py`）の項目順・値と同じで、
+`TypeAdapter(list[Schema]).dump_json` の結果とバイト列として一致する。
+
+備品のカテゴリは categories への外部キーで、カテゴリ名は外部結合で取得する
+（`ITEM_CATEGORY` / `join_item_category`）。
+
+ネストするリレーション（備品の団・指導者・スカウト）は `selectinload` と同じく
+リレーションごとに IN 句 1 回でまとめて取得し、同じ相手は 1 回だけ dict にする。
+
+備品一覧は `fields`（返す項目）と `expand`（ネストするリレーション）で
+取得する列とリレーションを絞れる（`item_projection`）。
+"""
+from typing import Iterable, NamedTuple, Optional, Sequence
+
+from fastapi import HTTPException
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sqlalchemy import func, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Query, Session
+
+from app.models import Category as CategoryModel, Group as GroupModel, Item as ItemModel
+from app.models import Leader as LeaderModel, Scout as ScoutModel
+from app.schemas import Group, Item, Leader, Scout
+
+
+def schema_columns(schema: type[BaseModel], model, expressions: Optional[dict] = None) -> list:
+    """スキーマの項目のうち、モデルの列（または `expressions` の式）をスキーマの項目順で返す"""
+    expressions = expressions or {}
+    table_columns = model.__table__.columns
+    return [
+        expressions[name] if name in expressions else getattr(model, name)
+        for name in schema.model_fields
+        if name in expressions or name in table_columns
+    ]
+
+
+# カテゴリ未設定の備品は空文字を返す
+ITEM_CATEGORY = func.coalesce(CategoryModel.name, "").label("category")
+
+
+def join_item_category(statement):
+    """`ITEM_CATEGORY` を取得するクエリに categories を外部結合する"""
+    return statement.outerjoin(CategoryModel, CategoryModel.id == ItemModel.category_id)
+
+
+class Relation(NamedTuple):
+    foreign_key: str
+    model: type
+    columns: list
+
+
+ITEM_COLUMNS = schema_columns(Item, ItemModel, {"category": ITEM_CATEGORY})
+ITEM_RELATIONS = {
+    "group": Relation("owner_group_id", GroupModel, schema_columns(Group, GroupModel)),
+    "approved_leader": Relation(
+        "approved_leader_id", LeaderModel, schema_columns(Leader, LeaderModel)
+    ),
+    "responsible_scout": Relation(
+        "responsible_scout_id", ScoutModel, schema_columns(Scout, ScoutModel)
+    ),
+}
+ITEM_FIELDS = {column.key for column in ITEM_COLUMNS}
+LEADER_COLUMNS = schema_columns(Leader, LeaderModel)
+SCOUT_COLUMNS = schema_columns(Scout, ScoutModel)
+
+
+class ItemProjection(NamedTuple):
+    columns: list
+    relations: dict[str, Relation]
+    # 並び替え・リレーション取得のためだけに取得し、レスポンスからは除く列
+    hidden: set[str]
+
+
+def _split_names(value: str, allowed, kind: str) -> list[str]:
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown {kind}: {', '.join(unknown)}")
+    return names
+
+
+def item_projection(fields: Optional[str], expand: Optional[str], sort: str) -> ItemProjection:
+    """`fields` / `expand` から取得する列とリレーションを決める
+
+    どちらも未指定なら全項目・全リレーション。`expand=`（空）ならリレーションなし。
+    `id` は常に返す。
+    """
+    if expand is None:
+        relations = ITEM_RELATIONS
+    else:
+        relations = {
+            name: ITEM_RELATIONS[name] for name in _split_names(expand, ITEM_RELATIONS, "expand")
+        }
+    if fields is None:
+        requested = set(ITEM_FIELDS)
+    else:
+        requested = set(_split_names(fields, ITEM_FIELDS, "field")) | {"id"}
+
+    needed = requested | {sort} | {relation.foreign_key for relation in relations.values()}
+    columns = [column for column in ITEM_COLUMNS if column.key in needed]
+    return ItemProjection(columns, relations, needed - requested)
+
+
+def query_item_columns(db: Session, columns: list) -> Query:
+    """備品の列を取得するクエリ（カテゴリ名を含むときだけ categories を結合する）"""
+    query = db.query(*columns).select_from(ItemModel)
+    if any(column is ITEM_CATEGORY for column in columns):
+        query = join_item_category(query)
+    return query
+
+
+def rows_to_json(rows: Iterable[Row]) -> bytes:
+    return to_json([row._asdict() for row in rows])
+
+
+def _load_related(db: Session, rows: Sequence[Row], relation: Relation) -> dict[int, dict]:
+    ids = {getattr(row, relation.foreign_key) for row in rows} - {None}
+    if not ids:
+        return {}
+    related = db.execute(select(*relation.columns).where(relation.model.id.in_(ids)))
+    return {row.id: row._asdict() for row in related}
+
+
+def load_item_relations(
+    db: Session, rows: Sequence[Row], relations: dict[str, Relation] = ITEM_RELATIONS
+) -> dict[str, dict[int, dict]]:
+    """ネストするリレーションをリレーションごとに IN 句 1 回で取得する"""
+    return {name: _load_related(db, rows, relation) for name, relation in relations.items()}
+
+
+def item_rows_to_json(
+    rows: Sequence[Row],
+    loaded: dict[str, dict[int, dict]],
+    relations: dict[str, Relation] = ITEM_RELATIONS,
+    hidden: Iterable[str] = (),
+) -> bytes:
+    """備品の行に取得済みのリレーションを付けて JSON にする（DB にはアクセスしない）"""
+    items = []
+    for row in rows:
+        item = row._asdict()
+        for name, relation in relations.items():
+            item[name] = loaded[name].get(item[relation.foreign_key])
+        for name in hidden:
+            del item[name]
+        items.append(item)
+    return to_json(items)
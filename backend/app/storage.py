@@ -0,0 +1,197 @@
+"""備品画像のストレージ
+
+`StorageBackend` を実装したバックエンドを環境変数 `STORAGE_BACKEND` で選ぶ。
+
+- `supabase`: Supabase Storage の REST API を、プロセス内で 1 つだけ作る
+  `httpx.Client` で呼び出す（TLS 接続をワーカー内で再利用する）
+- `local`: `LOCAL_STORAGE_DIR` 配下に保存し、API の `/storage` で配信する
+  （オフラインでの開発・計測用）
+
+未指定時は `SUPABASE_URL` があれば `supabase`、無ければ `local`。
+
+呼び出しは同期 API なので、`async def` のエンドポイントからは
+`run_in_threadpool` 経由で呼び、イベントループを止めないこと。
+"""
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Iterator, Optional
+
+if TYPE_CHECKING:
+    import httpx
+
+SUPABASE_URL = os.getenv("SUPABASE_URL", "")
+SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
+SUPABASE_STORAGE_BUCKET = os.getenv("SUPABASE_STORAGE_BUCKET", "item-photos")
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "supabase" if SUPABASE_URL else "local")
+LOCAL_STORAGE_DIR = os.getenv("LOCAL_STORAGE_DIR", "./storage")
+LOCAL_STORAGE_URL_PREFIX = "/storage/"
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# 削除はバックグラウンドのワーカーが行うため、詰まったら早めに諦めて再試行に回す
+STORAGE_REMOVE_TIMEOUT_SECONDS = float(os.getenv("STORAGE_REMOVE_TIMEOUT_SECONDS", "10"))
+
+
+class StorageError(RuntimeError):
+    pass
+
+
+def content_key(digest: str) -> str:
+    """内容のハッシュからストレージ上のパス（拡張子なし）を作る
+
+    同じ画像は同じパスになるため、再アップロード時は転送を省略でき、
+    複数の備品で共有される画像も 1 つだけ保存される。
+    """
+    return f"{digest[:2]}/{digest}"
+
+
+class StorageBackend:
+    """画像ストレージのインターフェース"""
+
+    def upload(self, path: str, stream: BinaryIO, size: int, content_type: str) -> str:
+        """ファイルオブジェクトを保存し、公開 URL を返す"""
+        raise NotImplementedError
+
+    def exists(self, path: str) -> bool:
+        raise NotImplementedError
+
+    def remove(self, paths: list[str]) -> None:
+        raise NotImplementedError
+
+    def public_url(self, path: str) -> str:
+        raise NotImplementedError
+
+    def path_from_url(self, url: str) -> Optional[str]:
+        """公開 URL からストレージ上のパスを取り出す（このストレージ以外なら None）"""
+        raise NotImplementedError
+
+
+class SupabaseStorage(StorageBackend):
+    def __init__(self, url: str, service_role_key: str, bucket: str) -> None:
+        self.url = url.rstrip("/")
+        self.service_role_key = service_role_key
+        self.bucket = bucket
+        self._client: Optional["httpx.Client"] = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> "httpx.Client":
+        # httpx の import はコールドスタートで重いため、最初の利用時まで遅らせる
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    import httpx
+
+                    if not self.url or not self.service_role_key:
+                        raise StorageError("Supabase Storage is not configured")
+                    self._client = httpx.Client(
+                        base_url=f"{self.url}/storage/v1",
+                        headers={
+                            "Authorization": f"Bearer {self.service_role_key}",
+                            "apikey": self.service_role_key,
+                        },
+                        timeout=httpx.Timeout(30.0, connect=5.0),
+                    )
+        return self._client
+
+    def public_url(self, path: str) -> str:
+        return f"{self.url}/storage/v1/object/public/{self.bucket}/{path}"
+
+    def path_from_url(self, url: str) -> Optional[str]:
+        marker = f"/storage/v1/object/public/{self.bucket}/"
+        if marker not in url:
+            return None
+        return url.split(marker, 1)[-1] or None
+
+    def upload(self, path: str, stream: BinaryIO, size: int, content_type: str) -> str:
+        """チャンク単位で送信する
+
+        サイズは事前に分かっているので Content-Length を付け、chunked 転送にはしない。
+        """
+
+        def chunks() -> Iterator[bytes]:
+            while chunk := stream.read(UPLOAD_CHUNK_SIZE):
+                yield chunk
+
+        response = self.client.post(
+            f"/object/{self.bucket}/{path}",
+            content=chunks(),
+            headers={
+                "Content-Type": content_type,
+                "Content-Length": str(size),
+                "x-upsert": "true",
+            },
+        )
+        if response.is_error:
+            raise StorageError(f"{response.status_code} {response.text}")
+        return self.public_url(path)
+
+    def exists(self, path: str) -> bool:
+        response = self.client.head(f"/object/{self.bucket}/{path}")
+        if response.status_code in (400, 404):
+            return False
+        if response.is_error:
+            raise StorageError(f"{response.status_code} {response.text}")
+        return True
+
+    def remove(self, paths: list[str]) -> None:
+        if not paths:
+            return
+        response = self.client.request(
+            "DELETE",
+            f"/object/{self.bucket}",
+            json={"prefixes": paths},
+            timeout=STORAGE_REMOVE_TIMEOUT_SECONDS,
+        )
+        if response.is_error:
+            raise StorageError(f"{response.status_code} {response.text}")
+
+
+class LocalStorage(StorageBackend):
+    def __init__(self, root: str, url_prefix: str = LOCAL_STORAGE_URL_PREFIX) -> None:
+        self.root = Path(root).resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.url_prefix = url_prefix
+
+    def _resolve(self, path: str) -> Path:
+        resolved = (self.root / path).resolve()
+        if not resolved.is_relative_to(self.root):
+            raise StorageError(f"Invalid storage path: {path}")
+        return resolved
+
+    def public_url(self, path: str) -> str:
+        return self.url_prefix + path
+
+    def path_from_url(self, url: str) -> Optional[str]:
+        if not url.startswith(self.url_prefix):
+            return None
+        return url[len(self.url_prefix):] or None
+
+    def upload(self, path: str, stream: BinaryIO, size: int, content_type: str) -> str:
+        """一時ファイルに書いてから rename する（書きかけのファイルを配信しない）"""
+        target = self._resolve(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=target.parent, delete=False) as tmp:
+            shutil.copyfileobj(stream, tmp, UPLOAD_CHUNK_SIZE)
+        os.replace(tmp.name, target)
+        return self.public_url(path)
+
+    def exists(self, path: str) -> bool:
+        return self._resolve(path).is_file()
+
+    def remove(self, paths: list[str]) -> None:
+        for path in paths:
+            self._resolve(path).unlink(missing_ok=True)
+
+
+def create_storage() -> StorageBackend:
+    if STORAGE_BACKEND == "local":
+        return LocalStorage(LOCAL_STORAGE_DIR)
+    if STORAGE_BACKEND == "supabase":
+        return SupabaseStorage(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY, SUPABASE_STORAGE_BUCKET)
+    raise StorageError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND}")
+
+
+storage: StorageBackend = create_storage()
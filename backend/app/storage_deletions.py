@@ -0,0 +1,224 @@
+"""ストレージ画像の削除キュー
+
+備品の削除や画像の差し替えでは、古い画像のパスを `storage_deletions` に
+同じトランザクションで登録するだけにして、ストレージへの削除要求は
+バックグラウンドのワーカーがまとめて（1 回の `remove` で複数パス）行う。
+
+- キューは DB に永続化されるため、再起動や Lambda のフリーズをまたいでも消えない
+- 失敗したバッチは指数バックオフ（上限 `RETRY_MAX_SECONDS`）で再試行する
+- 複数ワーカーが同じパスを二重に削除しても、存在しないオブジェクトの削除は無害
+- 画像は内容のハッシュで保存され複数の備品で共有されうるため、
+  まだいずれかの備品が参照しているパスは削除せずにキューから外す
+  （参照の確認は行をリースで確保した後に行う。`process_due_deletions` 参照）
+- ストレージへの削除要求はトランザクションの外で行う。確保した行には `claimed_at` を入れて
+  コミットし、ワーカーが途中で止まっても `LEASE_SECONDS` 後には別のワーカーが拾い直す
+"""
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import delete, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models import Item, StorageDeletion
+from app.query_budget import uncounted
+from app.storage import STORAGE_REMOVE_TIMEOUT_SECONDS, storage
+
+logger = logging.getLogger(__name__)
+
+DELETE_BATCH_SIZE = 100
+POLL_SECONDS = float(os.getenv("STORAGE_DELETE_POLL_SECONDS", "30"))
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 60 * 60
+# 確保した行を処理中とみなす時間（ストレージの削除タイムアウトより長くする）
+LEASE_SECONDS = max(60.0, STORAGE_REMOVE_TIMEOUT_SECONDS * 2)
+CLAIM_WAIT_POLL_SECONDS = 0.5
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS))
+
+
+def _unclaimed(now: datetime):
+    """リースの無い（または切れた）行の条件"""
+    return or_(
+        StorageDeletion.claimed_at.is_(None),
+        StorageDeletion.claimed_at < now - timedelta(seconds=LEASE_SECONDS),
+    )
+
+
+def enqueue_image_deletions(db: Session, image_urls: Iterable[Optional[str]]) -> None:
+    """画像 URL をまとめて 1 文で削除キューに登録する（コミットは呼び出し側で行う）"""
+    paths = {storage.path_from_url(image_url) for image_url in image_urls if image_url} - {None}
+    if paths:
+        now = _utcnow()
+        db.execute(
+            insert(StorageDeletion),
+            [{"path": path, "attempts": 0, "next_attempt_at": now} for path in sorted(paths)],
+        )
+
+
+def cancel_image_deletions(db: Session, paths: Iterable[str]) -> None:
+    """再利用するパスの削除予約を取り消す（コミットは呼び出し側で行う）
+
+    ワーカーが処理中の行は残す（`wait_for_claimed_deletions` で終わるのを待てる）。
+    """
+    db.execute(
+        delete(StorageDeletion)
+        .where(StorageDeletion.path.in_(list(paths)), _unclaimed(_utcnow()))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def claimed_paths(db: Session, paths: Iterable[str]) -> set[str]:
+    """ワーカーが削除を処理中（リース中）のパスを返す"""
+    now = _utcnow()
+    return set(db.scalars(
+        select(StorageDeletion.path).where(
+            StorageDeletion.path.in_(list(paths)),
+            StorageDeletion.claimed_at >= now - timedelta(seconds=LEASE_SECONDS),
+        )
+    ))
+
+
+def wait_for_claimed_deletions(session_factory: Callable[[], Session], paths: Iterable[str]) -> None:
+    """処理中の削除が終わる（行が消えるかリースが切れる）まで待つ
+
+    待つ間の確認はクエリ予算に数えない。
+    """
+    paths = list(paths)
+    deadline = time.monotonic() + LEASE_SECONDS
+    with uncounted():
+        db = session_factory()
+        try:
+            while claimed_paths(db, paths) and time.monotonic() < deadline:
+                db.rollback()
+                time.sleep(CLAIM_WAIT_POLL_SECONDS)
+        finally:
+            db.close()
+
+
+def _referenced_paths(db: Session, paths: set[str]) -> set[str]:
+    urls = {storage.public_url(path): path for path in paths}
+    referenced: set[str] = set()
+    for column in (Item.image_url, Item.thumbnail_url, Item.medium_image_url):
+        referenced.update(db.scalars(select(column).where(column.in_(list(urls)))))
+    return {urls[url] for url in referenced}
+
+
+def _claim_due_deletions(db: Session, now: datetime) -> list:
+    """期限の来た行に `claimed_at` を入れて確保し、コミットする
+
+    他のワーカーがロック中の行は飛ばす（PostgreSQL）。
+    """
+    due = (
+        select(StorageDeletion.id)
+        .where(StorageDeletion.next_attempt_at <= now, _unclaimed(now))
+        .order_by(StorageDeletion.id)
+        .limit(DELETE_BATCH_SIZE)
+        .with_for_update(skip_locked=True)
+    )
+    rows = db.execute(
+        update(StorageDeletion)
+        .where(StorageDeletion.id.in_(due))
+        .values(claimed_at=now)
+        .returning(StorageDeletion.id, StorageDeletion.path)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+    return rows
+
+
+def process_due_deletions(session_factory: Callable[[], Session]) -> int:
+    """期限の来た削除をまとめて実行し、処理した件数を返す
+
+    行を確保してから参照を確認し、ストレージへの削除はトランザクションの外で行う。
+    同じパスを再利用するアップロードは、コミット後に処理中の行が片付くのを待ち、
+    ここで消された画像を上げ直す。
+    """
+    db = session_factory()
+    try:
+        now = _utcnow()
+        rows = _claim_due_deletions(db, now)
+        if not rows:
+            return 0
+
+        paths = {row.path for row in rows}
+        paths -= _referenced_paths(db, paths)
+        db.commit()
+        # 自分のリースが残っている行だけを片付ける
+        claimed = (
+            StorageDeletion.id.in_([row.id for row in rows]),
+            StorageDeletion.claimed_at == now,
+        )
+        try:
+            storage.remove(sorted(paths))
+        except Exception as e:
+            retries = db.query(StorageDeletion).filter(*claimed)
+            for row in retries:
+                row.attempts += 1
+                row.next_attempt_at = now + _retry_delay(row.attempts)
+                row.last_error = str(e)[:500]
+                row.claimed_at = None
+            db.commit()
+            logger.warning("Storage deletion of %d objects failed: %s", len(rows), e)
+            return 0
+
+        db.execute(delete(StorageDeletion).where(*claimed).execution_options(synchronize_session=False))
+        db.commit()
+        return len(rows)
+    finally:
+        db.close()
+
+
+class StorageDeletionWorker:
+    """削除キューを処理するデーモンスレッド
+
+    `notify()` で即時に起こせる。起こされなくても `POLL_SECONDS` ごとに
+    再試行待ちのバッチを確認する。
+    """
+
+    def __init__(self, session_factory: Callable[[], Session]) -> None:
+        self.session_factory = session_factory
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="storage-deletion-worker", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def notify(self) -> None:
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                processed = process_due_deletions(self.session_factory)
+            except Exception:
+                logger.exception("Storage deletion worker failed")
+                processed = 0
+            # 1 バッチ分すべて処理できたときは残りがある可能性が高いので続けて処理する
+            if processed >= DELETE_BATCH_SIZE:
+                continue
+            self._wake.wait(POLL_SECONDS)
+            self._wake.clear()
@@ -0,0 +1,71 @@
+"""テーブル単位の変更バージョン
+
+更新系の処理は同じトランザクション内で `bump_version` を呼び、
+`table_versions` の該当行を +1 する。複数ワーカーのプロセス内キャッシュは
+この値を比較して古くなったかどうかを判断する。
+
+更新したテーブル名は `session.info[BUMPED_TABLES]` に記録され、コミット後に
+`on_tables_committed` で登録したコールバック（マスタキャッシュ・一覧の結果キャッシュ）へ
+渡されて、自プロセスのキャッシュを即時に破棄する。
+"""
+from typing import Callable
+
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+
+from app.models import TableVersion
+
+CATEGORIES = "categories"
+GROUPS = "groups"
+ITEMS = "items"
+LEADERS = "leaders"
+SCOUTS = "scouts"
+
+BUMPED_TABLES = "bumped_tables"
+
+
+def bump_version(db: Session, name: str) -> None:
+    """バージョンを +1 する（コミットは呼び出し側で行う）"""
+    result = db.execute(
+        update(TableVersion)
+        .where(TableVersion.name == name)
+        .values(version=TableVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        db.add(TableVersion(name=name, version=1))
+        db.flush()
+    db.info.setdefault(BUMPED_TABLES, set()).add(name)
+
+
+def get_version(db: Session, name: str) -> int:
+    version = db.scalar(select(TableVersion.version).where(TableVersion.name == name))
+    return version or 0
+
+
+def get_versions(db: Session, names: tuple[str, ...]) -> dict[str, int]:
+    rows = db.execute(
+        select(TableVersion.name, TableVersion.version).where(TableVersion.name.in_(names))
+    )
+    versions = dict(rows.all())
+    return {name: versions.get(name, 0) for name in names}
+
+
+_commit_callbacks: list[Callable[[set[str]], None]] = []
+
+
+def on_tables_committed(callback: Callable[[set[str]], None]) -> None:
+    """バージョンを上げたトランザクションのコミット後に、テーブル名の集合を渡して呼ぶ"""
+    _commit_callbacks.append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_bumped(session: Session) -> None:
+    tables = session.info.pop(BUMPED_TABLES, None)
+    if tables:
+        for callback in _commit_callbacks:
+            callback(tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_bumped(session: Session) -> None:
+    session.info.pop(BUMPED_TABLES, None)
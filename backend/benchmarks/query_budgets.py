@@ -0,0 +1,120 @@
+"""エンドポイントのクエリ予算チェック
+
+一時 SQLite DB とローカルストレージに対して `@query_budget(n)` を宣言した
+エンドポイントを `SQL_QUERY_BUDGET_MODE=strict` で呼び、予算を超えたリクエストがあれば
+発行された SQL を出して 1 で終了する。予算を宣言しているのに下の `REQUESTS` で
+呼んでいないエンドポイントがあっても 1 で終了する（予算の確認漏れを防ぐ）。
+
+画像アップロードは新規・差し替え・同じ画像の再アップロード（転送の省略）と、
+再アップロードでの差し替えを確認する。
+
+    cd backend
+    python benchmarks/query_budgets.py
+
+エンドポイントの処理を変えたら CI で実行し、宣言した予算とのずれを検出する。
+"""
+import io
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+WORK_DIR = Path(tempfile.mkdtemp())
+os.environ["DATABASE_URL"] = f"sqlite:///{WORK_DIR / 'budgets.db'}"
+os.environ["SQL_QUERY_BUDGET_MODE"] = "strict"
+os.environ["STORAGE_BACKEND"] = "local"
+os.environ["LOCAL_STORAGE_DIR"] = str(WORK_DIR / "storage")
+os.environ.setdefault("ADMIN_PASSWORD", "query-budgets")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from PIL import Image  # noqa: E402
+from starlette.routing import Match  # noqa: E402
+
+from app.query_budget import QueryBudgetExceeded  # noqa: E402
+
+ADMIN_HEADERS = {"X-Admin-Password": os.environ["ADMIN_PASSWORD"]}
+
+ITEM = {
+    "name": "予算確認用テント", "category": "テント", "status": "保管中",
+    "location": "倉庫A", "owner_group_id": 1,
+}
+
+
+def _image(color: str) -> dict:
+    buffer = io.BytesIO()
+    Image.new("RGB", (640, 480), color).save(buffer, format="PNG")
+    return {"file": ("photo.png", buffer.getvalue(), "image/png")}
+
+
+# (メソッド, パス, TestClient.request に渡す引数)
+REQUESTS = [
+    ("GET", "/api/items", {}),
+    ("GET", "/api/items?limit=5&sort=name", {}),
+    ("GET", "/api/items?search=テント&fields=id,name", {}),
+    ("GET", "/api/items/1", {}),
+    ("GET", "/api/items/stats", {}),
+    ("GET", "/api/jamboree/packing-list", {}),
+    ("POST", "/api/items", {"json": ITEM}),
+    ("PUT", "/api/items/1", {"json": {"status": "貸出中", "category": "照明器具", "owner_group_id": 2}}),
+    ("PATCH", "/api/items/bulk", {"json": {"ids": [1, 2], "changes": {"category": "テント"}}}),
+    ("PATCH", "/api/items/bulk", {"json": {"filter": {"owner_group_id": 1}, "changes": {"note": "点検済み"}}}),
+    ("POST", "/api/items/1/photo", {"files": _image("red")}),
+    ("POST", "/api/items/1/photo", {"files": _image("blue")}),
+    ("POST", "/api/items/2/photo", {"files": _image("blue")}),
+    ("POST", "/api/items/3/photo", {"files": _image("green")}),
+    ("POST", "/api/items/3/photo", {"files": _image("blue")}),
+    ("POST", "/api/leaders/bulk-delete", {"json": {"ids": [1, 2]}}),
+    ("POST", "/api/leaders/bulk-restore", {"json": {"ids": [1, 2]}}),
+    ("PATCH", "/api/leaders/bulk", {"json": {"ids": [1, 2], "group_id": 2}}),
+    ("POST", "/api/scouts/bulk-delete", {"json": {"ids": [1, 2]}}),
+    ("POST", "/api/scouts/bulk-restore", {"json": {"ids": [1, 2]}}),
+    ("PATCH", "/api/scouts/bulk", {"json": {"ids": [1, 2], "group_id": 2, "patrol": "はと班"}}),
+]
+
+
+def _budgeted_routes(app) -> list:
+    return [
+        route for route in app.routes
+        if hasattr(getattr(route, "endpoint", None), "__query_budget__")
+    ]
+
+
+def _route_for(routes, method: str, path: str):
+    scope = {"type": "http", "method": method, "path": path.split("?")[0]}
+    return next((route for route in routes if route.matches(scope)[0] == Match.FULL), None)
+
+
+def main() -> None:
+    from main import app
+
+    routes = _budgeted_routes(app)
+    exercised = set()
+    failures = 0
+    with TestClient(app) as client:
+        for method, path, options in REQUESTS:
+            route = _route_for(routes, method, path)
+            if route is None:
+                print(f"NG {method} {path}: no @query_budget endpoint matches")
+                failures += 1
+                continue
+            exercised.add(route.endpoint)
+            try:
+                response = client.request(method, path, headers=ADMIN_HEADERS, **options)
+                response.raise_for_status()
+            except QueryBudgetExceeded as e:
+                failures += 1
+                print(f"NG {e}")
+                continue
+            print(f"OK {method} {path} (budget {route.endpoint.__query_budget__})")
+
+    unchecked = [route for route in routes if route.endpoint not in exercised]
+    for route in unchecked:
+        print(f"NG {'/'.join(sorted(route.methods))} {route.path}: not exercised by REQUESTS")
+
+    print(f"checked {len(REQUESTS)} requests: {failures} failed, {len(unchecked)} unchecked endpoints")
+    sys.exit(1 if failures or unchecked else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""エンドポイントのクエリプランチェック
+
+大量の合成データを入れた一時 SQLite DB に対して主要な参照・更新エンドポイントを呼び、
+発行された SQL を `EXPLAIN QUERY PLAN` にかける。備品・スカウト・指導者テーブルを
+インデックスなしで全件走査（`SCAN <table>`）するクエリがあれば、プランを出して 1 で終了する。
+
+条件なしで id 順に 1 ページ分読むクエリ（`SCAN items` でも LIMIT 件で止まる）は対象外。
+
+    cd backend
+    python benchmarks/query_plans.py --items 50000
+
+インデックスの追加・クエリの変更後に CI で実行し、全件走査への退行を検出する。
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+DATABASE_PATH = Path(tempfile.mkdtemp()) / "plans.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DATABASE_PATH}"
+os.environ["SQL_QUERY_BUDGET_MODE"] = "off"
+os.environ["ASYNC_READS"] = "0"
+os.environ.setdefault("ADMIN_PASSWORD", "query-plans")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event, insert, text  # noqa: E402
+
+from app.bootstrap import prepare_schema  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+from app.models import Item, Leader, Scout  # noqa: E402
+from app.normalize import normalize_search_key  # noqa: E402
+from app.seed import seed_initial_data  # noqa: E402
+
+CHECKED_TABLES = ("items", "scouts", "leaders")
+ADMIN_HEADERS = {"X-Admin-Password": os.environ["ADMIN_PASSWORD"]}
+
+# (メソッド, パス, JSON ボディ)。ページネーションは 2 ページ目（カーソル条件付き）も確認する
+REQUESTS = [
+    ("GET", "/api/items?limit=50", None),
+    ("GET", "/api/items?limit=50&sort=name", None),
+    ("GET", "/api/items?limit=50&status=貸出中", None),
+    ("GET", "/api/items?limit=50&status=貸出中&sort=name", None),
+    ("GET", "/api/items?limit=50&search=テント12", None),
+    ("GET", "/api/items/1", None),
+    ("GET", "/api/items/stats", None),
+    ("GET", "/api/jamboree/packing-list", None),
+    ("GET", "/api/scouts?limit=50", None),
+    ("GET", "/api/scouts?limit=50&sort=name", None),
+    ("GET", "/api/scouts?limit=50&search=すかうと12", None),
+    ("GET", "/api/leaders?limit=50", None),
+    ("GET", "/api/leaders?limit=50&sort=name", None),
+    ("GET", "/api/leaders?limit=50&search=指導者12", None),
+    ("PATCH", "/api/items/bulk", {"filter": {"owner_group_id": 3}, "changes": {"note": "点検済み"}}),
+    ("PATCH", "/api/items/bulk", {"filter": {"category": "照明器具"}, "changes": {"note": "点検済み"}}),
+    ("PATCH", "/api/scouts/bulk", {"ids": [1, 2, 3], "patrol": "はと班"}),
+]
+
+# 全行を集計するため走査が前提のクエリ（プランの確認対象外）
+FULL_SCAN_EXPECTED = [
+    re.compile(r"GROUP BY items\.bring_to_jamboree"),
+]
+
+FULL_SCAN = re.compile(r"^SCAN (?P<table>\w+)$")
+
+
+def _populate(item_count: int) -> None:
+    prepare_schema(engine)
+    db = SessionLocal()
+    try:
+        seed_initial_data(db)
+        group_count = 9
+        leader_count = max(item_count // 50, 100)
+        scout_count = max(item_count // 10, 500)
+        db.execute(insert(Leader), [
+            {"name": f"指導者{i}", "name_key": normalize_search_key(f"指導者{i}"),
+             "group_id": i % group_count + 1, "is_deleted": i % 10 == 0}
+            for i in range(leader_count)
+        ])
+        db.execute(insert(Scout), [
+            {"name": f"スカウト{i}", "name_kana": f"すかうと{i}",
+             "name_key": normalize_search_key(f"スカウト{i}"),
+             "name_kana_key": normalize_search_key(f"すかうと{i}"),
+             "group_id": i % group_count + 1, "patrol": f"班{i % 8}", "is_deleted": i % 10 == 0}
+            for i in range(scout_count)
+        ])
+        category_count = 9  # seed_initial_data のカテゴリ
+        statuses = ["保管中", "保管中", "保管中", "貸出中", "要メンテ"]
+        db.execute(insert(Item), [
+            {"name": f"テント{i}", "name_key": normalize_search_key(f"テント{i}"),
+             "category_id": i % category_count + 1, "status": statuses[i % len(statuses)],
+             "quantity": i % 5 + 1, "bring_to_jamboree": i % 7 == 0, "location": f"倉庫{i % 40}",
+             "owner_group_id": i % group_count + 1,
+             "approved_leader_id": i % leader_count + 1 if i % 3 else None,
+             "responsible_scout_id": i % scout_count + 1 if i % 4 else None}
+            for i in range(item_count)
+        ])
+        db.commit()
+        db.execute(text("ANALYZE"))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _capture_statements() -> list[tuple[str, object]]:
+    from main import app
+
+    statements: list[tuple[str, object]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        with TestClient(app) as client:
+            for method, path, body in REQUESTS:
+                response = client.request(method, path, json=body, headers=ADMIN_HEADERS)
+                response.raise_for_status()
+                cursor = response.headers.get("X-Next-Cursor")
+                if method == "GET" and cursor:
+                    separator = "&" if "?" in path else "?"
+                    client.get(f"{path}{separator}cursor={cursor}").raise_for_status()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return statements
+
+
+def _problems(statement: str, plan: list[str]) -> list[str]:
+    if "LIMIT" in statement and " WHERE " not in statement:
+        return []
+    if any(pattern.search(statement) for pattern in FULL_SCAN_EXPECTED):
+        return []
+    return [
+        line
+        for line in plan
+        if (match := FULL_SCAN.match(line)) and match.group("table") in CHECKED_TABLES
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check endpoint query plans for full scans")
+    parser.add_argument("--items", type=int, default=50000)
+    parser.add_argument("--verbose", action="store_true", help="すべてのクエリのプランを表示する")
+    args = parser.parse_args()
+
+    _populate(args.items)
+    statements = _capture_statements()
+
+    failures = 0
+    checked = 0
+    seen = set()
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            tables = set(re.findall(r"\b(?:FROM|JOIN|UPDATE)\s+(\w+)", statement))
+            if not statement.lstrip().upper().startswith(("SELECT", "UPDATE")):
+                continue
+            if not tables & set(CHECKED_TABLES) or statement in seen:
+                continue
+            seen.add(statement)
+            checked += 1
+            plan = [
+                row[3]
+                for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            ]
+            problems = _problems(statement, plan)
+            if problems or args.verbose:
+                print(("NG " if problems else "OK ") + " ".join(statement.split()))
+                for line in plan:
+                    print(f"    {line}")
+            failures += bool(problems)
+
+    print(f"checked {checked} queries against {args.items} items: {failures} with full scans")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""参照系エンドポイントのスループット計測
+
+同じデータを入れた一時 DB に対して uvicorn を `ASYNC_READS=1`（AsyncSession）と
+`ASYNC_READS=0`（同期セッション + スレッドプール）で起動し、
+同時接続数ごとの requests/sec を比較する。
+
+    cd backend
+    python benchmarks/read_endpoints.py --concurrency 16 64 --duration 10
+
+`DATABASE_URL` を指定するとその DB をそのまま使う（PostgreSQL での計測用。データ投入はしない）。
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+PATHS = [
+    "/api/items?limit=50",
+    "/api/items?search=テント1&limit=50",
+    "/api/items/1",
+    "/api/groups",
+    "/api/categories",
+    "/api/scouts?limit=50",
+    "/api/leaders?limit=50",
+]
+
+
+def _prepare_sqlite(item_count: int) -> str:
+    url = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    script = f"""
+from sqlalchemy import insert
+from app.bootstrap import prepare_schema
+from app.database import SessionLocal, engine
+from app.models import Item
+from app.normalize import normalize_search_key
+from app.seed import seed_initial_data
+
+prepare_schema(engine)
+db = SessionLocal()
+seed_initial_data(db)
+db.execute(insert(Item), [
+    {{"name": f"テント{{i}}", "name_key": normalize_search_key(f"テント{{i}}"), "category_id": 1,
+      "status": "保管中", "quantity": 1, "bring_to_jamboree": False, "location": f"倉庫{{i % 20}}",
+      "owner_group_id": i % 9 + 1}}
+    for i in range({item_count})
+])
+db.commit()
+db.close()
+"""
+    subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "DATABASE_URL": url},
+        check=True,
+    )
+    return url
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(database_url: str, async_reads: bool) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "ASYNC_READS": "1" if async_reads else "0",
+        "SQL_QUERY_BUDGET_MODE": "off",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            httpx.get(base_url + "/", timeout=0.5)
+            return process, base_url
+        except httpx.TransportError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("server did not start")
+
+
+async def _load(base_url: str, concurrency: int, duration: float) -> tuple[int, int]:
+    completed = 0
+    failed = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+
+        async def worker(offset: int) -> None:
+            nonlocal completed, failed
+            index = offset
+            while time.perf_counter() < deadline:
+                response = await client.get(PATHS[index % len(PATHS)])
+                if response.status_code == 200:
+                    completed += 1
+                else:
+                    failed += 1
+                index += 1
+
+        await asyncio.gather(*(worker(offset) for offset in range(concurrency)))
+    return completed, failed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare sync and async read endpoints")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--items", type=int, default=5000)
+    args = parser.parse_args()
+
+    database_url = os.getenv("DATABASE_URL") or _prepare_sqlite(args.items)
+    print(f"database: {database_url}")
+    print(f"{'mode':<6} {'concurrency':>11} {'req/s':>10} {'failed':>7}")
+    for async_reads in (False, True):
+        process, base_url = _start_server(database_url, async_reads)
+        try:
+            # 接続・キャッシュを温めてから計測する
+            asyncio.run(_load(base_url, 4, 1))
+            for concurrency in args.concurrency:
+                completed, failed = asyncio.run(_load(base_url, concurrency, args.duration))
+                mode = "async" if async_reads else "sync"
+                print(f"{mode:<6} {concurrency:>11} {completed / args.duration:>10.1f} {failed:>7}")
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""リードレプリカへの振り分けチェック
+
+一時 SQLite DB をプライマリ（`DATABASE_URL`）とレプリカ（`DATABASE_READ_URL`）に分け、
+起動後にプライマリをレプリカへ複製してから、プライマリだけに指導者と備品を追加する。
+追加分が見えるのは管理者パスワード付きの `X-Read-Primary: 1` だけで、
+ヘッダーだけ・パスワード違いはレプリカから読むことを、`get_read_runner`（指導者一覧）と
+`get_read_db`（備品の集計）の両方で確認し、違えば 1 で終了する。
+
+    cd backend
+    python benchmarks/read_routing.py
+    ASYNC_READS=0 python benchmarks/read_routing.py
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+WORK_DIR = Path(tempfile.mkdtemp())
+PRIMARY_DB = WORK_DIR / "primary.db"
+REPLICA_DB = WORK_DIR / "replica.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{PRIMARY_DB}"
+os.environ["DATABASE_READ_URL"] = f"sqlite:///{REPLICA_DB}"
+os.environ["STORAGE_BACKEND"] = "local"
+os.environ["LOCAL_STORAGE_DIR"] = str(WORK_DIR / "storage")
+os.environ.setdefault("ADMIN_PASSWORD", "read-routing")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+ADMIN_HEADERS = {"X-Admin-Password": os.environ["ADMIN_PASSWORD"]}
+LEADER_NAME = "振り分け確認用指導者"
+ITEM = {
+    "name": "振り分け確認用テント", "category": "テント", "status": "保管中",
+    "location": "倉庫A", "owner_group_id": 1,
+}
+
+# (説明, ヘッダー, プライマリから読むべきか)
+CASES = [
+    ("no headers", {}, False),
+    ("X-Read-Primary without password", {"X-Read-Primary": "1"}, False),
+    ("X-Read-Primary with wrong password", {"X-Read-Primary": "1", "X-Admin-Password": "wrong"}, False),
+    ("admin password without X-Read-Primary", ADMIN_HEADERS, False),
+    ("X-Read-Primary with admin password", {"X-Read-Primary": "1", **ADMIN_HEADERS}, True),
+]
+
+
+def _copy_primary_to_replica() -> None:
+    with sqlite3.connect(PRIMARY_DB) as source, sqlite3.connect(REPLICA_DB) as target:
+        source.backup(target)
+
+
+def main() -> None:
+    from main import app
+
+    failures = 0
+    checked = 0
+    with TestClient(app) as client:
+        _copy_primary_to_replica()
+        replica_total = client.get("/api/items/stats").json()["total_count"]
+        client.post(
+            "/api/leaders", headers=ADMIN_HEADERS, json={"name": LEADER_NAME, "group_id": 1}
+        ).raise_for_status()
+        client.post("/api/items", headers=ADMIN_HEADERS, json=ITEM).raise_for_status()
+
+        # (パス, レスポンスがプライマリへの追加分を含むか)
+        probes = [
+            (f"/api/leaders?search={LEADER_NAME}", lambda body: len(body) > 0),
+            ("/api/items/stats", lambda body: body["total_count"] > replica_total),
+        ]
+        for label, headers, expect_primary in CASES:
+            for path, sees_primary in probes:
+                response = client.get(path, headers=headers)
+                response.raise_for_status()
+                found = sees_primary(response.json())
+                ok = found == expect_primary
+                failures += not ok
+                checked += 1
+                source = "primary" if found else "replica"
+                print(f"{'OK' if ok else 'NG'} {label}: GET {path} read from {source}")
+
+    print(f"checked {checked} requests: {failures} failed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""備品一覧のシリアライズ計測
+
+インメモリ SQLite に備品を入れ、一覧 1 回分（取得 + JSON 化）の所要時間を比較する。
+
+- before: ORM + selectinload で取得し、FastAPI の既定経路（`response_model` での検証 →
+  `jsonable_encoder` → `json.dumps`）で JSON にする
+- after: 列のタプルで取得し、dict から `pydantic_core.to_json` で JSON にする（app/serialization.py）
+
+    cd backend
+    python benchmarks/serialization.py --items 10000 --repeat 5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ.setdefault("SQL_QUERY_BUDGET_MODE", "off")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from sqlalchemy.orm import selectinload, sessionmaker  # noqa: E402
+
+from app.database import Base  # noqa: E402
+from app.models import Category, Group, Item as ItemModel, Leader, Scout  # noqa: E402
+from app.schemas import Item  # noqa: E402
+from app.serialization import (  # noqa: E402
+    ITEM_COLUMNS, item_rows_to_json, load_item_relations, query_item_columns,
+)
+
+
+def _prepare(item_count: int):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Group), [{"name": f"団{i}"} for i in range(10)])
+        conn.execute(insert(Category), [{"name": "テント", "sort_order": 1, "is_active": True}])
+        conn.execute(
+            insert(Leader),
+            [{"name": f"指導者{i}", "group_id": i % 10 + 1, "phone": "090-0000-0000",
+              "email": f"leader{i}@example.com", "is_deleted": False} for i in range(50)],
+        )
+        conn.execute(
+            insert(Scout),
+            [{"name": f"スカウト{i}", "name_kana": f"すかうと{i}", "group_id": i % 10 + 1,
+              "is_deleted": False} for i in range(200)],
+        )
+        conn.execute(
+            insert(ItemModel),
+            [{"name": f"テント{i}", "category_id": 1, "status": "保管中", "quantity": i % 5 + 1,
+              "bring_to_jamboree": i % 2 == 0, "location": f"倉庫{i % 20}",
+              "owner_group_id": i % 10 + 1, "approved_leader_id": i % 50 + 1 if i % 3 else None,
+              "responsible_scout_id": i % 200 + 1 if i % 4 else None, "note": "備考"}
+             for i in range(item_count)],
+        )
+    return sessionmaker(bind=engine)
+
+
+# FastAPI が `response_model=List[Item]` から作るのと同じレスポンスフィールド
+RESPONSE_FIELD = create_model_field(name="Response", type_=List[Item], mode="serialization")
+
+
+def _fastapi_default(db) -> bytes:
+    rows = (
+        db.query(ItemModel)
+        .options(
+            selectinload(ItemModel.group),
+            selectinload(ItemModel.category_ref),
+            selectinload(ItemModel.approved_leader),
+            selectinload(ItemModel.responsible_scout),
+        )
+        .order_by(ItemModel.id)
+        .all()
+    )
+    content = asyncio.run(serialize_response(field=RESPONSE_FIELD, response_content=rows))
+    return JSONResponse(content).body
+
+
+def _fast(db) -> bytes:
+    rows = query_item_columns(db, ITEM_COLUMNS).order_by(ItemModel.id).all()
+    return item_rows_to_json(rows, load_item_relations(db, rows))
+
+
+def _measure(session_factory, fn, repeat: int) -> tuple[float, bytes]:
+    timings = []
+    body = b""
+    for _ in range(repeat):
+        db = session_factory()
+        try:
+            start = time.perf_counter()
+            body = fn(db)
+            timings.append(time.perf_counter() - start)
+        finally:
+            db.close()
+    return statistics.median(timings), body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure item list serialization cost")
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    session_factory = _prepare(args.items)
+    before_seconds, before_body = _measure(session_factory, _fastapi_default, args.repeat)
+    after_seconds, after_body = _measure(session_factory, _fast, args.repeat)
+
+    adapter = TypeAdapter(list[Item])
+    assert adapter.validate_json(before_body) == adapter.validate_json(after_body)
+
+    per_10k = 10000 / args.items
+    print(f"items: {args.items} (median of {args.repeat})")
+    print(f"before (ORM + response_model + jsonable_encoder): {before_seconds * 1000 * per_10k:8.1f} ms / 10k items")
+    print(f"after  (row tuples + pydantic_core.to_json):      {after_seconds * 1000 * per_10k:8.1f} ms / 10k items")
+    print(f"speedup: {before_seconds / after_seconds:.1f}x, body {len(after_body)} bytes")
+
+
+if __name__ == "__main__":
+    main()
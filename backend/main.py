@@ -1,15 +1,28 @@
-from fastapi import FastAPI, Depends, HTTPException, Query, UploadFile, File, Header
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
+from sqlalchemy import and_, false, func, or_, select, update
 from sqlalchemy.orm import Session
-from supabase import create_client, Client
-from typing import List, Optional
-import csv
+from typing import List, Literal, Optional
+import asyncio
+import hashlib
 import io
 import os
-import uuid
-import uvicorn
 
-from app.database import engine, get_db, Base
+from app.admin import require_admin_access, validate_admin_password
+from app.async_database import ReadRunner, dispose_async_engines, get_read_runner
+from app.bootstrap import ON_LAMBDA, prepare_schema
+from app.database import engine, get_db, get_read_db, pool_status, ReadSessionLocal, SessionLocal
+from app.etag import conditional_get
+from app.loading import item_detail_options
+from app.image_variants import (
+    IMAGE_VARIANTS,
+    generate_variants,
+    shutdown_executor as shutdown_image_executor,
+)
+from app.master_cache import category_cache, category_id_by_name, group_cache, group_exists
+from app.pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, paginate
 from app.models import (
     Category as CategoryModel,
     Item as ItemModel,
@@ -17,13 +30,44 @@ from app.models import (
     Leader as LeaderModel,
     Scout as ScoutModel,
 )
+from app.query_budget import QueryBudgetMiddleware, query_budget
+from app.result_cache import (
+    ITEM_CACHE_MAX_BYTES,
+    ITEM_CACHE_MAX_ENTRIES,
+    ITEM_CACHE_TTL_SECONDS,
+    ResultCache,
+)
+from app.search import apply_item_search, key_prefix_filter
+from app.serialization import (
+    ITEM_CATEGORY,
+    LEADER_COLUMNS,
+    SCOUT_COLUMNS,
+    ItemProjection,
+    item_projection,
+    item_rows_to_json,
+    load_item_relations,
+    join_item_category,
+    query_item_columns,
+    rows_to_json,
+)
+from app.storage import LOCAL_STORAGE_URL_PREFIX, LocalStorage, content_key, storage
+from app.storage_deletions import (
+    StorageDeletionWorker,
+    cancel_image_deletions,
+    claimed_paths,
+    enqueue_image_deletions,
+    wait_for_claimed_deletions,
+)
+from app.versions import CATEGORIES, GROUPS, ITEMS, LEADERS, SCOUTS, bump_version
 from app.schemas import (
     AdminAuthRequest, AdminAuthResponse,
-    Category, CategoryCreate,
-    Item, ItemCreate, ItemUpdate,
+    BulkIds, BulkResult,
+    Category, CategoryCreate, CategoryUpdate,
+    Item, ItemCreate, ItemUpdate, ItemStats, ItemStatsBucket,
+    ItemBulkUpdate, PackingList, PackingListLine,
     Group, GroupCreate,
-    Leader, LeaderCreate, LeaderUpdate,
-    Scout, ScoutCreate, ScoutUpdate
+    Leader, LeaderBulkReassign, LeaderCreate, LeaderUpdate,
+    Scout, ScoutBulkReassign, ScoutCreate, ScoutUpdate
 )
 
 app = FastAPI()
@@ -36,32 +80,6 @@ ALLOWED_IMAGE_MIME_TYPES = {
     "image/webp": ".webp",
 }
 
-SUPABASE_URL = os.getenv("SUPABASE_URL", "")
-SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
-SUPABASE_STORAGE_BUCKET = os.getenv("SUPABASE_STORAGE_BUCKET", "item-photos")
-ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "")
-
-
-def _get_supabase() -> Client:
-    return create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
-
-
-def _validate_admin_password(password: Optional[str]) -> None:
-    if not ADMIN_PASSWORD:
-        raise HTTPException(
-            status_code=503,
-            detail="管理者パスワードが設定されていません",
-        )
-
-    if password != ADMIN_PASSWORD:
-        raise HTTPException(status_code=401, detail="管理者認証に失敗しました")
-
-
-def require_admin_access(
-    x_admin_password: Optional[str] = Header(None, alias="X-Admin-Password"),
-) -> None:
-    _validate_admin_password(x_admin_password)
-
 # CORS設定（フロントエンドからのアクセスを許可）
 allowed_origins = os.getenv(
     "ALLOWED_ORIGINS",
@@ -74,204 +92,160 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
+app.add_middleware(QueryBudgetMiddleware)
+
+# ローカルストレージの画像は API から配信する
+if isinstance(storage, LocalStorage):
+    app.mount(
+        LOCAL_STORAGE_URL_PREFIX.rstrip("/"),
+        StaticFiles(directory=storage.root),
+        name="storage",
+    )
 
-# データベーステーブルを作成
-Base.metadata.create_all(bind=engine)
+def find_category_id(db: Session, name: str) -> Optional[int]:
+    # キャッシュにあれば DB は引かない（キャッシュが古い場合に備え、無いときだけ DB で確認）
+    category_id = category_id_by_name(db, name)
+    if category_id is not None:
+        return category_id
+    return db.scalar(select(CategoryModel.id).where(CategoryModel.name == name))
 
 
-def ensure_category(db: Session, category_name: str) -> None:
+def resolve_category(db: Session, category_name: str) -> Optional[int]:
+    """カテゴリ名を ID にする（未登録なら登録する）。空なら None"""
     name = category_name.strip()
     if not name:
-        return
+        return None
 
-    exists = db.query(CategoryModel).filter(CategoryModel.name == name).first()
-    if exists:
-        return
+    category_id = find_category_id(db, name)
+    if category_id is not None:
+        return category_id
 
-    db.add(CategoryModel(name=name, is_active=True))
+    category = CategoryModel(name=name, is_active=True)
+    db.add(category)
+    db.flush()
+    bump_version(db, CATEGORIES)
+    return category.id
 
 
-def _delete_item_image_storage(image_url: Optional[str]) -> None:
-    """Supabase Storage から画像を削除する"""
-    if not image_url:
-        return
+def _category_condition(db: Session, category_name: Optional[str]):
+    """カテゴリ名での絞り込みを category_id の条件にする（空ならカテゴリ未設定）"""
+    name = (category_name or "").strip()
+    if not name:
+        return ItemModel.category_id.is_(None)
+    category_id = find_category_id(db, name)
+    return ItemModel.category_id == category_id if category_id is not None else false()
 
-    try:
-        supabase = _get_supabase()
-        # URLからストレージパスを抽出
-        marker = f"/storage/v1/object/public/{SUPABASE_STORAGE_BUCKET}/"
-        if marker not in image_url:
-            return
-        storage_path = image_url.split(marker, 1)[-1]
-        if storage_path:
-            supabase.storage.from_(SUPABASE_STORAGE_BUCKET).remove([storage_path])
-    except Exception:
-        pass  # 削除失敗は握りつぶす（ベストエフォート）
+
+def _require_group(db: Session, group_id: Optional[int], detail: str) -> None:
+    """団 ID の存在を確認する（マスタキャッシュに無いときは DB で確認）"""
+    if group_id is not None and not group_exists(db, group_id):
+        raise HTTPException(status_code=400, detail=detail)
+
+
+# 備品レスポンスはカテゴリ名とネストした団・指導者・スカウトも含むため、それらの変更でも ETag を変える
+ITEM_LIST_TABLES = (ITEMS, CATEGORIES, GROUPS, LEADERS, SCOUTS)
+
+# 備品一覧のシリアライズ済みレスポンス（キーは ETag、app/result_cache.py）
+item_result_cache = ResultCache(
+    ITEM_LIST_TABLES, ITEM_CACHE_MAX_ENTRIES, ITEM_CACHE_MAX_BYTES, ITEM_CACHE_TTL_SECONDS
+)
+
+PageLimit = Query(None, ge=1, le=MAX_PAGE_SIZE, description="1ページの件数（未指定なら全件）")
+PageCursor = Query(None, description="前ページのレスポンスヘッダー X-Next-Cursor の値")
+PageSort = Query("id", description="並び順（id / name）")
+
+
+def _list_headers(response: Response) -> dict[str, str]:
+    """一覧で設定した ETag・カーソルのヘッダー（Response を直接返すときは引き継がれないため）"""
+    return {
+        name: response.headers[name]
+        for name in ("ETag", "Cache-Control", NEXT_CURSOR_HEADER)
+        if name in response.headers
+    }
+
+
+def _json_response(body: bytes, headers: dict[str, str]) -> Response:
+    return Response(body, media_type="application/json", headers=headers)
+
+
+async def _render_list(result) -> Response:
+    """一覧の読み込み結果をレスポンスにする
+
+    読み込み側は 304・キャッシュ済みの Response か、JSON を作る関数を返す。
+    行から JSON への変換は件数に比例して重いため、`run_sync`（イベントループの
+    スレッド）ではなくスレッドプールで行う。
+    """
+    if isinstance(result, Response):
+        return result
+    return await run_in_threadpool(result)
+
+
+def _get_item_or_404(db: Session, item_id: int) -> ItemModel:
+    """レスポンス用にリレーションを JOIN でまとめてロードした備品を取得"""
+    item = (
+        db.query(ItemModel)
+        .options(*item_detail_options())
+        .filter(ItemModel.id == item_id)
+        .first()
+    )
+    if item is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return item
+
+
+storage_deletion_worker = StorageDeletionWorker(SessionLocal)
+
+
+def _enqueue_item_images(db: Session, db_item: ItemModel) -> None:
+    """備品の元画像と縮小版をストレージ削除キューに登録"""
+    enqueue_image_deletions(
+        db, (db_item.image_url, db_item.thumbnail_url, db_item.medium_image_url)
+    )
 
 
 @app.on_event("startup")
 def startup_event():
-    """アプリ起動時に初期データを投入"""
-    db = next(get_db())
-    
-    # 既にデータがある場合はスキップ
-    if db.query(GroupModel).count() > 0:
+    """スキーマを準備する（Lambda ではリビジョンの確認のみ、app/bootstrap.py）
+
+    初期データの投入は `python -m app.seed` で行う。開発用の作成モードでのみ起動時にも投入する。
+    """
+    if prepare_schema(engine):
+        from app.seed import seed_initial_data
+
+        db = SessionLocal()
+        try:
+            seed_initial_data(db)
+        finally:
+            db.close()
+
+
+@app.on_event("startup")
+def start_storage_deletion_worker():
+    """画像削除キューのワーカーを起動（前回までの未処理分もここで拾う）
+
+    起動済みなら何もしないため、Lambda ではプロセスごとに 1 回だけ起動される。
+    """
+    storage_deletion_worker.start()
+
+
+@app.on_event("shutdown")
+def stop_storage_deletion_worker():
+    # Lambda では呼び出しごとに止めると join で応答が最大 5 秒遅れ、
+    # 次の呼び出しでワーカーと画像処理のプロセスプールを作り直すことになる
+    if ON_LAMBDA:
         return
-    
-    # 団データを追加
-    groups = [
-        GroupModel(name="春日部第９団", description="ボーイスカウト春日部第９団"),
-        GroupModel(name="春日部第７団", description="ボーイスカウト春日部第７団"),
-        GroupModel(name="久喜第１団", description="ボーイスカウト久喜第１団"),
-        GroupModel(name="久喜第２１団", description="ボーイスカウト久喜第２１団"),
-        GroupModel(name="蓮田第１団", description="ボーイスカウト蓮田第１団"),
-        GroupModel(name="蓮田第３団", description="ボーイスカウト蓮田第３団"),
-        GroupModel(name="加須第１団", description="ボーイスカウト加須第１団"),
-        GroupModel(name="宮代第１団", description="ボーイスカウト宮代第１団"),
-        GroupModel(name="共有", description="全団共有備品"),
-    ]
-    db.add_all(groups)
-    db.commit()
-    
-    # 指導者データを追加
-    leaders = [
-        LeaderModel(name="田中太郎", group_id=1, role="団委員長", gender="男", phone="090-1234-5678", email="tanaka@example.com"),
-        LeaderModel(name="鈴木花子", group_id=1, role="副長", gender="女", phone="090-2345-6789", email="suzuki@example.com"),
-        LeaderModel(name="佐藤一郎", group_id=2, role="隊長", gender="男", phone="090-3456-7890", email="sato@example.com"),
-        LeaderModel(name="山田美咲", group_id=3, role="副長", gender="女", phone="090-4567-8901", email="yamada@example.com"),
-    ]
-    db.add_all(leaders)
-    db.commit()
-    
-    # スカウトデータを追加
-    scouts = [
-        ScoutModel(name="高橋健太", name_kana="たかはしけんた", group_id=1, grade="小6", rank="1級", gender="男", patrol="イーグル班"),
-        ScoutModel(name="伊藤大輔", name_kana="いとうだいすけ", group_id=1, grade="小5", rank="2級", gender="男", patrol="タイガー班"),
-        ScoutModel(name="渡辺翔太", name_kana="わたなべしょうた", group_id=2, grade="中1", rank="初級", gender="男", patrol="ビーバー班"),
-        ScoutModel(name="中村陽菜", name_kana="なかむらひな", group_id=2, grade="中2", rank="1級", gender="女", patrol="パンダ班"),
-        ScoutModel(name="小林蓮", name_kana="こばやしれん", group_id=3, grade="中3", rank="菊", gender="男", patrol="ドラゴン班"),
-    ]
-    db.add_all(scouts)
-    db.commit()
-    
-    # サンプルカテゴリを追加
-    default_categories = [
-        "テント",
-        "寝具",
-        "調理器具",
-        "照明器具",
-        "食品保管",
-        "家具",
-        "電源設備",
-        "医療・安全",
-        "通信機器",
-    ]
-    db.add_all([
-        CategoryModel(name=category_name, sort_order=index)
-        for index, category_name in enumerate(default_categories, start=1)
-    ])
-    db.commit()
+    storage_deletion_worker.stop()
+    shutdown_image_executor()
 
-    # サンプル備品データを10件追加
-    sample_items = [
-        ItemModel(
-            name="テント（6人用）",
-            category="テント",
-            status="保管中",
-            location="倉庫A-1",
-            owner_group_id=1,
-            approved_leader_id=1,
-            note="2024年購入、状態良好"
-        ),
-        ItemModel(
-            name="寝袋（冬季用）",
-            category="寝具",
-            status="貸出中",
-            location="倉庫A-2",
-            owner_group_id=2,
-            approved_leader_id=3,
-            responsible_scout_id=3,
-            note="田中さんに貸出中（返却予定: 2026/2/20）"
-        ),
-        ItemModel(
-            name="ガスコンロ（2口）",
-            category="調理器具",
-            status="要メンテ",
-            location="倉庫B-3",
-            owner_group_id=3,
-            approved_leader_id=4,
-            note="着火が不安定、点検必要"
-        ),
-        ItemModel(
-            name="ランタン（LED）",
-            category="照明器具",
-            status="保管中",
-            location="倉庫C-1",
-            owner_group_id=1,
-            approved_leader_id=1,
-            responsible_scout_id=1,
-            note="予備の電池あり"
-        ),
-        ItemModel(
-            name="クーラーボックス（50L）",
-            category="食品保管",
-            status="保管中",
-            location="倉庫A-3",
-            owner_group_id=4,
-            note="保冷剤も一緒に保管"
-        ),
-        ItemModel(
-            name="折りたたみテーブル",
-            category="家具",
-            status="貸出中",
-            location="倉庫B-1",
-            owner_group_id=2,
-            approved_leader_id=3,
-            responsible_scout_id=4,
-            note="山田さんに貸出中（返却予定: 2026/2/25）"
-        ),
-        ItemModel(
-            name="折りたたみチェア（10脚セット）",
-            category="家具",
-            status="保管中",
-            location="倉庫B-2",
-            owner_group_id=4,
-            approved_leader_id=2,
-            note="2脚に軽微な傷あり"
-        ),
-        ItemModel(
-            name="ポータブル発電機",
-            category="電源設備",
-            status="要メンテ",
-            location="倉庫C-2",
-            owner_group_id=3,
-            approved_leader_id=4,
-            note="オイル交換が必要"
-        ),
-        ItemModel(
-            name="救急箱（大）",
-            category="医療・安全",
-            status="保管中",
-            location="管理室",
-            owner_group_id=4,
-            approved_leader_id=1,
-            note="常備薬・消毒液補充済み"
-        ),
-        ItemModel(
-            name="トランシーバー（5台セット）",
-            category="通信機器",
-            status="保管中",
-            location="倉庫C-3",
-            owner_group_id=1,
-            approved_leader_id=2,
-            responsible_scout_id=2,
-            note="充電器も完備"
-        ),
-    ]
-    
-    db.add_all(sample_items)
-    db.commit()
+
+@app.on_event("shutdown")
+async def close_async_engines():
+    # Lambda では呼び出しごとに破棄すると、毎回プールを作り直して DB に接続し直すことになる
+    if ON_LAMBDA:
+        return
+    await dispose_async_engines()
 
 
 @app.get("/")
@@ -281,19 +255,26 @@ def read_root() -> dict[str, str]:
 
 @app.post("/api/admin/auth", response_model=AdminAuthResponse)
 def authenticate_admin(auth_request: AdminAuthRequest):
-    _validate_admin_password(auth_request.password)
+    validate_admin_password(auth_request.password)
     return AdminAuthResponse(authenticated=True)
 
 
+@app.get("/api/admin/cache")
+def get_cache_stats(_: None = Depends(require_admin_access)):
+    """備品一覧の結果キャッシュのヒット率・使用量を取得"""
+    return item_result_cache.stats()
+
+
+@app.get("/api/admin/db-pool")
+def get_db_pool_status(_: None = Depends(require_admin_access)):
+    """DB 接続プールの状態を取得（接続枯渇の調査用）"""
+    return pool_status()
+
+
 @app.get("/api/categories", response_model=List[Category])
-def get_categories(db: Session = Depends(get_db)):
-    """カテゴリ一覧を取得"""
-    return (
-        db.query(CategoryModel)
-        .filter(CategoryModel.is_active == True)
-        .order_by(CategoryModel.sort_order.asc(), CategoryModel.name.asc())
-        .all()
-    )
+async def get_categories(read: ReadRunner = Depends(get_read_runner)):
+    """カテゴリ一覧を取得（マスタキャッシュから返す）"""
+    return [category for category in await read(category_cache.get) if category.is_active]
 
 
 @app.post("/api/categories", response_model=Category, status_code=201)
@@ -309,61 +290,230 @@ def create_category(
 
     db_category = CategoryModel(**category.model_dump())
     db.add(db_category)
+    bump_version(db, CATEGORIES)
     db.commit()
     db.refresh(db_category)
     return db_category
 
 
-@app.get("/api/items", response_model=List[Item])
-def get_items(
-    search: Optional[str] = Query(None, description="名前またはカテゴリで検索"),
+@app.put("/api/categories/{category_id}", response_model=Category)
+def update_category(
+    category_id: int,
+    category: CategoryUpdate,
+    db: Session = Depends(get_db),
+    _: None = Depends(require_admin_access),
+):
+    """カテゴリを更新（備品はカテゴリ ID で参照するため、名前の変更は備品側の更新なしで反映される）"""
+    db_category = db.get(CategoryModel, category_id)
+    if db_category is None:
+        raise HTTPException(status_code=404, detail="Category not found")
+
+    update_data = category.model_dump(exclude_unset=True, exclude_none=True)
+    if "name" in update_data:
+        name = update_data["name"].strip()
+        if not name:
+            raise HTTPException(status_code=400, detail="Category name is required")
+        existing = db.scalar(
+            select(CategoryModel.id).where(CategoryModel.name == name, CategoryModel.id != category_id)
+        )
+        if existing is not None:
+            raise HTTPException(status_code=400, detail="Category already exists")
+        update_data["name"] = name
+
+    for key, value in update_data.items():
+        setattr(db_category, key, value)
+
+    bump_version(db, CATEGORIES)
+    db.commit()
+    db.refresh(db_category)
+    return db_category
+
+
+# `fields` / `expand` を指定すると一部の項目だけの疎なオブジェクトを返すため、
+# `response_model` では検証せず、完全な形を OpenAPI のレスポンス例として載せる
+@app.get(
+    "/api/items",
+    responses={
+        200: {
+            "model": List[Item],
+            "description": "備品の一覧。`fields` / `expand` を指定した場合は、"
+            "指定した項目（と常に返す `id`）だけを持つオブジェクトになる",
+        }
+    },
+)
+@query_budget(5)
+async def get_items(
+    request: Request,
+    response: Response,
+    search: Optional[str] = Query(None, description="名前・カテゴリ・保管場所・備考で全文検索"),
     status: Optional[str] = Query(None, description="ステータスでフィルタ"),
-    db: Session = Depends(get_db)
+    limit: Optional[int] = PageLimit,
+    cursor: Optional[str] = PageCursor,
+    sort: Literal["id", "name"] = PageSort,
+    fields: Optional[str] = Query(None, description="返す項目をカンマ区切りで指定（id は常に返す）"),
+    expand: Optional[str] = Query(
+        None, description="ネストするリレーション（group,approved_leader,responsible_scout）。空なら無し"
+    ),
+    read: ReadRunner = Depends(get_read_runner),
+):
+    """備品一覧を取得（検索・フィルタ・カーソルページネーション・項目の絞り込み対応）"""
+    projection = item_projection(fields, expand, sort)
+    return await _render_list(await read(
+        _list_items, request, response, search, status, limit, cursor, sort, projection
+    ))
+
+
+def _list_items(
+    db: Session,
+    request: Request,
+    response: Response,
+    search: Optional[str],
+    status: Optional[str],
+    limit: Optional[int],
+    cursor: Optional[str],
+    sort: str,
+    projection: ItemProjection,
 ):
-    """備品一覧を取得（検索・フィルタ対応）"""
-    query = db.query(ItemModel)
+    not_modified = conditional_get(request, response, db, ITEM_LIST_TABLES)
+    if not_modified:
+        return not_modified
+
+    cache_key = response.headers["ETag"]
+    cached = item_result_cache.get(cache_key)
+    if cached is not None:
+        return _json_response(cached.body, cached.headers)
+
+    # ORM オブジェクトを作らず、レスポンスの項目の列だけを取得する（app/serialization.py）
+    query = query_item_columns(db, projection.columns)
     
     # 検索条件を適用
+    relevance = None
     if search:
-        search_filter = f"%{search}%"
-        query = query.filter(
-            (ItemModel.name.like(search_filter)) |
-            (ItemModel.category.like(search_filter))
-        )
+        query, relevance = apply_item_search(db, query, search)
     
     # ステータスフィルタを適用
     if status:
         query = query.filter(ItemModel.status == status)
+
+    # ページネーションしない検索は関連度順（キーセットは (sort, id) 順が前提）
+    if relevance is not None and limit is None and cursor is None:
+        query = query.order_by(relevance)
     
-    items = query.all()
-    return items
+    rows = paginate(query, ItemModel, sort, limit, cursor, response)
+    loaded = load_item_relations(db, rows, projection.relations)
+    headers = _list_headers(response)
+
+    def render() -> Response:
+        body = item_rows_to_json(rows, loaded, projection.relations, projection.hidden)
+        item_result_cache.put(cache_key, body, headers)
+        return _json_response(body, headers)
+
+    return render
+
+
+@app.get("/api/items/stats", response_model=ItemStats)
+@query_budget(5)
+def get_item_stats(request: Request, response: Response, db: Session = Depends(get_read_db)):
+    """備品の件数・数量をステータス・所有団・カテゴリ・持参フラグ別に集計"""
+    not_modified = conditional_get(request, response, db, (ITEMS, CATEGORIES))
+    if not_modified:
+        return not_modified
+
+    def group_counts(column, *group_by) -> list[ItemStatsBucket]:
+        query = db.query(
+            column,
+            func.count(ItemModel.id),
+            func.coalesce(func.sum(ItemModel.quantity), 0),
+        ).select_from(ItemModel)
+        if column is ITEM_CATEGORY:
+            query = join_item_category(query)
+        rows = query.group_by(*(group_by or (column,))).order_by(column).all()
+        return [
+            ItemStatsBucket(key=key, count=count, quantity=quantity)
+            for key, count, quantity in rows
+        ]
+
+    by_status = group_counts(ItemModel.status)
+    return ItemStats(
+        total_count=sum(bucket.count for bucket in by_status),
+        total_quantity=sum(bucket.quantity for bucket in by_status),
+        by_status=by_status,
+        by_owner_group=group_counts(ItemModel.owner_group_id),
+        # カテゴリは category_id で集計し、名前は結合で引く
+        by_category=group_counts(ITEM_CATEGORY, ItemModel.category_id, CategoryModel.name),
+        by_bring_to_jamboree=group_counts(ItemModel.bring_to_jamboree),
+    )
+
+
+@app.get("/api/items/export.csv")
+def export_items_csv(_: None = Depends(require_admin_access)):
+    """備品をCSVでエクスポート（CSV取り込みと同じ列構成）"""
+    from app.csv_export import ITEM_CSV_COLUMNS, csv_response, item_export_statement
+
+    return csv_response(
+        ReadSessionLocal, item_export_statement(), ITEM_CSV_COLUMNS, "items.csv"
+    )
+
+
+@app.get("/api/jamboree/packing-list", response_model=PackingList)
+@query_budget(2)
+def get_packing_list(request: Request, response: Response, db: Session = Depends(get_read_db)):
+    """ジャンボリー持参品リスト（所有団・カテゴリ・保管場所・担当者ごとの件数と数量）"""
+    from app.packing_list import packing_list_statement
+
+    not_modified = conditional_get(request, response, db, ITEM_LIST_TABLES)
+    if not_modified:
+        return not_modified
+
+    lines = [PackingListLine(**row._asdict()) for row in db.execute(packing_list_statement())]
+    return PackingList(
+        total_count=sum(line.item_count for line in lines),
+        total_quantity=sum(line.quantity for line in lines),
+        lines=lines,
+    )
+
+
+@app.get("/api/jamboree/packing-list.csv")
+def export_packing_list_csv(_: None = Depends(require_admin_access)):
+    """ジャンボリー持参品リストをCSVでエクスポート（管理者のみ）"""
+    from app.csv_export import csv_response
+    from app.packing_list import PACKING_LIST_COLUMNS, packing_list_statement
+
+    return csv_response(
+        ReadSessionLocal, packing_list_statement(), PACKING_LIST_COLUMNS, "packing-list.csv"
+    )
 
 
 @app.get("/api/items/{item_id}", response_model=Item)
-def get_item(item_id: int, db: Session = Depends(get_db)):
+@query_budget(1)
+async def get_item(item_id: int, read: ReadRunner = Depends(get_read_runner)):
     """備品の詳細を取得"""
-    item = db.query(ItemModel).filter(ItemModel.id == item_id).first()
-    if item is None:
-        raise HTTPException(status_code=404, detail="Item not found")
-    return item
+    return await read(_get_item_or_404, item_id)
 
 
+# 更新系の予算はマスタキャッシュの再読込とバージョン更新を含む最悪値
 @app.post("/api/items", response_model=Item, status_code=201)
+@query_budget(10)
 def create_item(
     item: ItemCreate,
     db: Session = Depends(get_db),
     _: None = Depends(require_admin_access),
 ):
     """新しい備品を登録"""
-    ensure_category(db, item.category)
-    db_item = ItemModel(**item.model_dump())
+    _require_group(db, item.owner_group_id, "Group not found")
+    item_data = item.model_dump()
+    item_data["category_id"] = resolve_category(db, item_data.pop("category"))
+    db_item = ItemModel(**item_data)
     db.add(db_item)
+    db.flush()
+    item_id = db_item.id
+    bump_version(db, ITEMS)
     db.commit()
-    db.refresh(db_item)
-    return db_item
+    return _get_item_or_404(db, item_id)
 
 
 @app.put("/api/items/{item_id}", response_model=Item)
+@query_budget(11)
 def update_item(
     item_id: int,
     item: ItemUpdate,
@@ -376,16 +526,109 @@ def update_item(
         raise HTTPException(status_code=404, detail="Item not found")
     
     update_data = item.model_dump(exclude_unset=True)
-    if "category" in update_data and update_data["category"]:
-        ensure_category(db, update_data["category"])
+    if "owner_group_id" in update_data:
+        _require_group(db, update_data["owner_group_id"], "Group not found")
+    if "category" in update_data:
+        category_name = update_data.pop("category")
+        if category_name is not None:
+            update_data["category_id"] = resolve_category(db, category_name)
 
     # 更新されたフィールドのみを適用
     for key, value in update_data.items():
         setattr(db_item, key, value)
     
+    bump_version(db, ITEMS)
     db.commit()
-    db.refresh(db_item)
-    return db_item
+    return _get_item_or_404(db, item_id)
+
+
+def _require_ids(db: Session, model, ids: set[int], detail: str) -> None:
+    """指定した ID がすべて存在することを 1 クエリで確認する"""
+    if not ids:
+        return
+    found = set(db.scalars(select(model.id).where(model.id.in_(ids))))
+    if found != ids:
+        raise HTTPException(status_code=400, detail=detail)
+
+
+def _bulk_update(db: Session, model, table: str, ids: list[int], condition, values: dict) -> BulkResult:
+    """ID を指定した 1 回の UPDATE で更新し、更新できた ID と見つからなかった ID を返す"""
+    requested = set(ids)
+    if not requested:
+        return BulkResult(updated=[])
+    updated = db.scalars(
+        update(model)
+        .where(model.id.in_(requested), condition)
+        .values(**values)
+        .returning(model.id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    if updated:
+        bump_version(db, table)
+    db.commit()
+    return BulkResult(updated=sorted(updated), missing=sorted(requested - set(updated)))
+
+
+@app.patch("/api/items/bulk", response_model=BulkResult)
+@query_budget(14)
+def bulk_update_items(
+    payload: ItemBulkUpdate,
+    db: Session = Depends(get_db),
+    _: None = Depends(require_admin_access),
+):
+    """複数の備品をまとめて更新（ID 指定または条件指定、1 トランザクション・1 UPDATE）"""
+    changes = payload.changes.model_dump(exclude_unset=True)
+    if not changes:
+        raise HTTPException(status_code=400, detail="No changes specified")
+    if (payload.ids is None) == (payload.filter is None):
+        raise HTTPException(status_code=400, detail="Specify either ids or filter")
+
+    if payload.ids is not None:
+        ids = set(payload.ids)
+        if not ids:
+            return BulkResult(updated=[])
+        condition = ItemModel.id.in_(ids)
+    else:
+        conditions = payload.filter.model_dump(exclude_unset=True)
+        if not conditions:
+            raise HTTPException(status_code=400, detail="Filter must have at least one condition")
+        ids = set()
+        condition = and_(*(
+            _category_condition(db, value) if key == "category" else getattr(ItemModel, key) == value
+            for key, value in conditions.items()
+        ))
+
+    # NOT NULL の列への明示的な null は UPDATE の前に弾く（IntegrityError で 500 にしない）
+    null_fields = [
+        key for key, value in changes.items()
+        if value is None and key in ItemModel.__table__.c and not ItemModel.__table__.c[key].nullable
+    ]
+    if null_fields:
+        raise HTTPException(status_code=400, detail=f"{', '.join(null_fields)} cannot be null")
+    if "owner_group_id" in changes:
+        _require_group(db, changes["owner_group_id"], "Group not found")
+    if changes.get("approved_leader_id") is not None:
+        _require_ids(db, LeaderModel, {changes["approved_leader_id"]}, "Leader not found")
+    if changes.get("responsible_scout_id") is not None:
+        _require_ids(db, ScoutModel, {changes["responsible_scout_id"]}, "Scout not found")
+    if "category" in changes:
+        category_name = changes.pop("category")
+        if category_name is not None:
+            changes["category_id"] = resolve_category(db, category_name)
+        if not changes:
+            raise HTTPException(status_code=400, detail="No changes specified")
+
+    updated = db.scalars(
+        update(ItemModel)
+        .where(condition)
+        .values(**changes)
+        .returning(ItemModel.id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    if updated:
+        bump_version(db, ITEMS)
+    db.commit()
+    return BulkResult(updated=sorted(updated), missing=sorted(ids - set(updated)))
 
 
 @app.delete("/api/items/{item_id}", status_code=204)
@@ -399,24 +642,94 @@ def delete_item(
     if db_item is None:
         raise HTTPException(status_code=404, detail="Item not found")
 
-    _delete_item_image_storage(db_item.image_url)
-
+    # ストレージの削除はキューに登録し、リクエスト外でまとめて行う
+    _enqueue_item_images(db, db_item)
     db.delete(db_item)
+    bump_version(db, ITEMS)
     db.commit()
+    storage_deletion_worker.notify()
     return None
 
 
+async def _missing_photo_objects(paths: dict[str, str], names: list[str]) -> list[str]:
+    """ストレージに存在しない画像の種類名を返す"""
+    exists = await asyncio.gather(
+        *(run_in_threadpool(storage.exists, paths[name]) for name in names)
+    )
+    return [name for name, found in zip(names, exists) if not found]
+
+
+async def _upload_photo_objects(
+    file: UploadFile, total_size: int, paths: dict[str, str], names: list[str]
+) -> list:
+    """指定した種類の画像をアップロードし、各結果（URL または例外）を返す"""
+    if not names:
+        return []
+    # 縮小版はプロセスプールで生成する（サイズ上限内なのでここだけは全体を読む）
+    await file.seek(0)
+    try:
+        variants = await generate_variants(await file.read())
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid image file")
+    await file.seek(0)
+    streams = {"original": (file.file, total_size, file.content_type)} | {
+        name: (io.BytesIO(data), len(data), "image/webp")
+        for name, data in variants.items()
+    }
+    return await asyncio.gather(
+        *(run_in_threadpool(storage.upload, paths[name], *streams[name]) for name in names),
+        return_exceptions=True,
+    )
+
+
+def _find_item_or_404(db: Session, item_id: int) -> ItemModel:
+    db_item = db.query(ItemModel).filter(ItemModel.id == item_id).first()
+    if db_item is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return db_item
+
+
+def _discard_uploaded_photos(db: Session, results: list) -> None:
+    """一部だけ成功したアップロードを削除キューへ（他の備品が参照していれば残る）"""
+    enqueue_image_deletions(
+        db, (result for result in results if not isinstance(result, Exception))
+    )
+    db.commit()
+    storage_deletion_worker.notify()
+
+
+def _attach_item_photo(db: Session, db_item: ItemModel, paths: dict[str, str]) -> None:
+    """備品の画像 URL を差し替え、古い画像を削除キューに登録してコミットする"""
+    urls = {name: storage.public_url(path) for name, path in paths.items()}
+    new_urls = set(urls.values())
+    enqueue_image_deletions(db, (
+        image_url
+        for image_url in (db_item.image_url, db_item.thumbnail_url, db_item.medium_image_url)
+        if image_url not in new_urls
+    ))
+    # 再利用するパスに削除予約が残っていれば取り消す（ワーカーが処理中の行はコミット後に待つ）
+    cancel_image_deletions(db, paths.values())
+    db_item.image_url = urls["original"]
+    db_item.thumbnail_url = urls["thumb"]
+    db_item.medium_image_url = urls["medium"]
+    bump_version(db, ITEMS)
+    db.commit()
+    storage_deletion_worker.notify()
+
+
 @app.post("/api/items/{item_id}/photo", response_model=Item)
+@query_budget(7)
 async def upload_item_photo(
     item_id: int,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     _: None = Depends(require_admin_access),
 ):
-    """備品画像をSupabase Storageにアップロード"""
-    db_item = db.query(ItemModel).filter(ItemModel.id == item_id).first()
-    if db_item is None:
-        raise HTTPException(status_code=404, detail="Item not found")
+    """備品画像をストレージにアップロード（サムネイル・中サイズの WebP も生成）
+
+    ストレージと DB の待ちでイベントループを止めないよう、どちらもスレッドプールで実行する。
+    """
+    db_item = await run_in_threadpool(_find_item_or_404, db, item_id)
 
     if file.content_type not in ALLOWED_IMAGE_MIME_TYPES:
         raise HTTPException(
@@ -424,63 +737,65 @@ async def upload_item_photo(
             detail="Only JPEG, PNG, and WEBP images are allowed",
         )
 
-    chunks: list[bytes] = []
-    total_size = 0
+    ext = ALLOWED_IMAGE_MIME_TYPES[file.content_type]
+
+    # サイズ確認と同時に内容のハッシュを取り、保存先のパスにする（全体をメモリに結合しない）
     try:
-        while True:
-            chunk = await file.read(1024 * 1024)
-            if not chunk:
-                break
+        total_size = 0
+        digest = hashlib.sha256()
+        while chunk := await file.read(1024 * 1024):
             total_size += len(chunk)
             if total_size > PHOTO_MAX_SIZE_BYTES:
                 raise HTTPException(
                     status_code=413,
                     detail=f"Image size must be <= {PHOTO_MAX_SIZE_MB}MB",
                 )
-            chunks.append(chunk)
+            digest.update(chunk)
+
+        base_path = content_key(digest.hexdigest())
+        paths = {"original": base_path + ext} | {
+            name: f"{base_path}_{name}.webp" for name in IMAGE_VARIANTS
+        }
+        # 同じ画像が保存済みなら転送も縮小版の生成も省略する
+        missing = await _missing_photo_objects(paths, list(paths))
+        reused = [name for name in paths if name not in missing]
+        results = await _upload_photo_objects(file, total_size, paths, missing)
+
+        errors = [result for result in results if isinstance(result, Exception)]
+        if errors:
+            await run_in_threadpool(_discard_uploaded_photos, db, results)
+            raise HTTPException(status_code=500, detail=f"Storage upload failed: {errors[0]}")
+
+        await run_in_threadpool(_attach_item_photo, db, db_item, paths)
+
+        # 再利用したパスを、参照のコミット前に削除ワーカーが消していれば上げ直す
+        if reused:
+            reused_paths = [paths[name] for name in reused]
+            if await run_in_threadpool(claimed_paths, db, reused_paths):
+                await run_in_threadpool(wait_for_claimed_deletions, SessionLocal, reused_paths)
+            lost = await _missing_photo_objects(paths, reused)
+            results = await _upload_photo_objects(file, total_size, paths, lost)
+            errors = [result for result in results if isinstance(result, Exception)]
+            if errors:
+                raise HTTPException(status_code=500, detail=f"Storage upload failed: {errors[0]}")
     finally:
         await file.close()
 
-    image_bytes = b"".join(chunks)
-    ext = ALLOWED_IMAGE_MIME_TYPES[file.content_type]
-    storage_path = f"item_{item_id}_{uuid.uuid4().hex}{ext}"
-
-    try:
-        supabase = _get_supabase()
-        supabase.storage.from_(SUPABASE_STORAGE_BUCKET).upload(
-            storage_path,
-            image_bytes,
-            file_options={"content-type": file.content_type, "upsert": "true"},
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Storage upload failed: {e}")
-
-    public_url = (
-        supabase.storage.from_(SUPABASE_STORAGE_BUCKET).get_public_url(storage_path)
-    )
-
-    old_image_url = db_item.image_url
-    db_item.image_url = public_url
-    db.commit()
-    db.refresh(db_item)
-
-    if old_image_url and old_image_url != db_item.image_url:
-        _delete_item_image_storage(old_image_url)
-
-    return db_item
+    return await run_in_threadpool(_get_item_or_404, db, item_id)
 
 
 # === Group endpoints ===
 @app.get("/api/groups", response_model=List[Group])
-def get_groups(db: Session = Depends(get_db)):
-    """団一覧を取得"""
-    return db.query(GroupModel).all()
+async def get_groups(read: ReadRunner = Depends(get_read_runner)):
+    """団一覧を取得（マスタキャッシュから返す）"""
+    return await read(group_cache.get)
 
 
 @app.get("/api/groups/{group_id}", response_model=Group)
-def get_group(group_id: int, db: Session = Depends(get_db)):
+async def get_group(group_id: int, read: ReadRunner = Depends(get_read_runner)):
     """団の詳細を取得"""
-    group = db.query(GroupModel).filter(GroupModel.id == group_id).first()
+    groups = await read(group_cache.get)
+    group = next((group for group in groups if group.id == group_id), None)
     if group is None:
         raise HTTPException(status_code=404, detail="Group not found")
     return group
@@ -495,6 +810,7 @@ def create_group(
     """新しい団を登録"""
     db_group = GroupModel(**group.model_dump())
     db.add(db_group)
+    bump_version(db, GROUPS)
     db.commit()
     db.refresh(db_group)
     return db_group
@@ -502,15 +818,57 @@ def create_group(
 
 # === Leader endpoints ===
 @app.get("/api/leaders", response_model=List[Leader])
-def get_leaders(
+async def get_leaders(
+    request: Request,
+    response: Response,
     include_deleted: bool = Query(False, description="削除済みも含める"),
-    db: Session = Depends(get_db),
+    search: Optional[str] = Query(None, description="名前の前方一致検索（かな・全半角・大小文字を区別しない）"),
+    limit: Optional[int] = PageLimit,
+    cursor: Optional[str] = PageCursor,
+    sort: Literal["id", "name"] = PageSort,
+    read: ReadRunner = Depends(get_read_runner),
 ):
-    """指導者一覧を取得"""
-    query = db.query(LeaderModel)
+    """指導者一覧を取得（検索・カーソルページネーション対応）"""
+    return await _render_list(await read(
+        _list_leaders, request, response, include_deleted, search, limit, cursor, sort
+    ))
+
+
+def _list_leaders(
+    db: Session,
+    request: Request,
+    response: Response,
+    include_deleted: bool,
+    search: Optional[str],
+    limit: Optional[int],
+    cursor: Optional[str],
+    sort: str,
+):
+    not_modified = conditional_get(request, response, db, (LEADERS,))
+    if not_modified:
+        return not_modified
+
+    query = db.query(*LEADER_COLUMNS)
     if not include_deleted:
         query = query.filter(LeaderModel.is_deleted == False)
-    return query.all()
+    if search:
+        query = query.filter(key_prefix_filter(db, LeaderModel.name_key, search))
+    rows = paginate(query, LeaderModel, sort, limit, cursor, response)
+    headers = _list_headers(response)
+    return lambda: _json_response(rows_to_json(rows), headers)
+
+
+@app.get("/api/leaders/export.csv")
+def export_leaders_csv(
+    include_deleted: bool = Query(False, description="削除済みも含める"),
+    _: None = Depends(require_admin_access),
+):
+    """指導者をCSVでエクスポート"""
+    from app.csv_export import LEADER_CSV_COLUMNS, csv_response, leader_export_statement
+
+    return csv_response(
+        ReadSessionLocal, leader_export_statement(include_deleted), LEADER_CSV_COLUMNS, "leaders.csv"
+    )
 
 
 @app.post("/api/leaders", response_model=Leader, status_code=201)
@@ -520,8 +878,10 @@ def create_leader(
     _: None = Depends(require_admin_access),
 ):
     """新しい指導者を登録"""
+    _require_group(db, leader.group_id, "指定された団が見つかりません")
     db_leader = LeaderModel(**leader.model_dump())
     db.add(db_leader)
+    bump_version(db, LEADERS)
     db.commit()
     db.refresh(db_leader)
     return db_leader
@@ -545,9 +905,12 @@ def update_leader(
     
     # 更新されたフィールドのみを適用
     update_data = leader.model_dump(exclude_unset=True)
+    if "group_id" in update_data:
+        _require_group(db, update_data["group_id"], "指定された団が見つかりません")
     for field, value in update_data.items():
         setattr(db_leader, field, value)
     
+    bump_version(db, LEADERS)
     db.commit()
     db.refresh(db_leader)
     return db_leader
@@ -569,6 +932,7 @@ def delete_leader(
         raise HTTPException(status_code=404, detail="指導者が見つかりません")
 
     db_leader.is_deleted = True
+    bump_version(db, LEADERS)
     db.commit()
     return {"message": "指導者を削除しました"}
 
@@ -589,22 +953,112 @@ def restore_leader(
         raise HTTPException(status_code=404, detail="指導者が見つかりません")
 
     db_leader.is_deleted = False
+    bump_version(db, LEADERS)
     db.commit()
     db.refresh(db_leader)
     return db_leader
 
 
+# 一括操作の missing には、存在しない ID と対象外の状態（削除済み・未削除）の ID が入る
+@app.post("/api/leaders/bulk-delete", response_model=BulkResult)
+@query_budget(4)
+def bulk_delete_leaders(
+    payload: BulkIds,
+    db: Session = Depends(get_db),
+    _: None = Depends(require_admin_access),
+):
+    """指導者をまとめて論理削除"""
+    return _bulk_update(
+        db, LeaderModel, LEADERS, payload.ids, LeaderModel.is_deleted == False, {"is_deleted": True}
+    )
+
+
+@app.post("/api/leaders/bulk-restore", response_model=BulkResult)
+@query_budget(4)
+def bulk_restore_leaders(
+    payload: BulkIds,
+    db: Session = Depends(get_db),
+    _: None = Depends(require_admin_access),
+):
+    """指導者をまとめて復元"""
+    return _bulk_update(
+        db, LeaderModel, LEADERS, payload.ids, LeaderModel.is_deleted == True, {"is_deleted": False}
+    )
+
+
+@app.patch("/api/leaders/bulk", response_model=BulkResult)
+@query_budget(6)
+def bulk_reassign_leaders(
+    payload: LeaderBulkReassign,
+    db: Session = Depends(get_db),
+    _: None = Depends(require_admin_access),
+):
+    """指導者の所属団をまとめて変更"""
+    _require_group(db, payload.group_id, "指定された団が見つかりません")
+    return _bulk_update(
+        db, LeaderModel, LEADERS, payload.ids, LeaderModel.is_deleted == False,
+        {"group_id": payload.group_id},
+    )
+
+
 # === Scout endpoints ===
 @app.get("/api/scouts", response_model=List[Scout])
-def get_scouts(
+async def get_scouts(
+    request: Request,
+    response: Response,
     include_deleted: bool = Query(False, description="削除済みも含める"),
-    db: Session = Depends(get_db),
+    search: Optional[str] = Query(None, description="名前・ふりがなの前方一致検索（かな・全半角・大小文字を区別しない）"),
+    limit: Optional[int] = PageLimit,
+    cursor: Optional[str] = PageCursor,
+    sort: Literal["id", "name"] = PageSort,
+    read: ReadRunner = Depends(get_read_runner),
 ):
-    """スカウト一覧を取得"""
-    query = db.query(ScoutModel)
+    """スカウト一覧を取得（検索・カーソルページネーション対応）"""
+    return await _render_list(await read(
+        _list_scouts, request, response, include_deleted, search, limit, cursor, sort
+    ))
+
+
+def _list_scouts(
+    db: Session,
+    request: Request,
+    response: Response,
+    include_deleted: bool,
+    search: Optional[str],
+    limit: Optional[int],
+    cursor: Optional[str],
+    sort: str,
+):
+    not_modified = conditional_get(request, response, db, (SCOUTS,))
+    if not_modified:
+        return not_modified
+
+    query = db.query(*SCOUT_COLUMNS)
     if not include_deleted:
         query = query.filter(ScoutModel.is_deleted == False)
-    return query.all()
+    if search:
+        query = query.filter(
+            or_(
+                key_prefix_filter(db, ScoutModel.name_key, search),
+                key_prefix_filter(db, ScoutModel.name_kana_key, search),
+            )
+        )
+    rows = paginate(query, ScoutModel, sort, limit, cursor, response)
+    headers = _list_headers(response)
+    return lambda: _json_response(rows_to_json(rows), headers)
+
+
+@app.get("/api/scouts/export.csv")
+def export_scouts_csv(
+    include_deleted: bool = Query(False, description="削除済みも含める"),
+    _: None = Depends(require_admin_access),
+):
+    """スカウトをCSVでエクスポート（CSV取り込みと同じ列構成）"""
+    from app.csv_export import SCOUT_CSV_COLUMNS, csv_response, scout_export_statement
+
+    return csv_response(
+        ReadSessionLocal, scout_export_statement(include_deleted), SCOUT_CSV_COLUMNS, "scouts.csv"
+    )
 
 
 @app.post("/api/scouts", response_model=Scout, status_code=201)
@@ -614,8 +1068,10 @@ def create_scout(
     _: None = Depends(require_admin_access),
 ):
     """新しいスカウトを登録"""
+    _require_group(db, scout.group_id, "指定された団が見つかりません")
     db_scout = ScoutModel(**scout.model_dump())
     db.add(db_scout)
+    bump_version(db, SCOUTS)
     db.commit()
     db.refresh(db_scout)
     return db_scout
@@ -639,9 +1095,12 @@ def update_scout(
     
     # 更新されたフィールドのみを適用
     update_data = scout.model_dump(exclude_unset=True)
+    if "group_id" in update_data:
+        _require_group(db, update_data["group_id"], "指定された団が見つかりません")
     for field, value in update_data.items():
         setattr(db_scout, field, value)
     
+    bump_version(db, SCOUTS)
     db.commit()
     db.refresh(db_scout)
     return db_scout
@@ -663,6 +1122,7 @@ def delete_scout(
         raise HTTPException(status_code=404, detail="スカウトが見つかりません")
 
     db_scout.is_deleted = True
+    bump_version(db, SCOUTS)
     db.commit()
     return {"message": "スカウトを削除しました"}
 
@@ -683,11 +1143,58 @@ def restore_scout(
         raise HTTPException(status_code=404, detail="スカウトが見つかりません")
 
     db_scout.is_deleted = False
+    bump_version(db, SCOUTS)
     db.commit()
     db.refresh(db_scout)
     return db_scout
 
 
+@app.post("/api/scouts/bulk-delete", response_model=BulkResult)
+@query_budget(4)
+def bulk_delete_scouts(
+    payload: BulkIds,
+    db: Session = Depends(get_db),
+    _: None = Depends(require_admin_access),
+):
+    """スカウトをまとめて論理削除"""
+    return _bulk_update(
+        db, ScoutModel, SCOUTS, payload.ids, ScoutModel.is_deleted == False, {"is_deleted": True}
+    )
+
+
+@app.post("/api/scouts/bulk-restore", response_model=BulkResult)
+@query_budget(4)
+def bulk_restore_scouts(
+    payload: BulkIds,
+    db: Session = Depends(get_db),
+    _: None = Depends(require_admin_access),
+):
+    """スカウトをまとめて復元"""
+    return _bulk_update(
+        db, ScoutModel, SCOUTS, payload.ids, ScoutModel.is_deleted == True, {"is_deleted": False}
+    )
+
+
+@app.patch("/api/scouts/bulk", response_model=BulkResult)
+@query_budget(6)
+def bulk_reassign_scouts(
+    payload: ScoutBulkReassign,
+    db: Session = Depends(get_db),
+    _: None = Depends(require_admin_access),
+):
+    """スカウトの所属団・班をまとめて変更"""
+    changes = payload.model_dump(exclude_unset=True, exclude={"ids"})
+    if not changes:
+        raise HTTPException(status_code=400, detail="変更する項目を指定してください")
+    if "group_id" in changes:
+        if changes["group_id"] is None:
+            raise HTTPException(status_code=400, detail="指定された団が見つかりません")
+        _require_group(db, changes["group_id"], "指定された団が見つかりません")
+    return _bulk_update(
+        db, ScoutModel, SCOUTS, payload.ids, ScoutModel.is_deleted == False, changes
+    )
+
+
 @app.post("/api/scouts/upload-csv", status_code=201)
 async def upload_scouts_csv(
     file: UploadFile = File(...),
@@ -700,13 +1207,15 @@ async def upload_scouts_csv(
     name,name_kana,group_id,grade,rank,gender,patrol
     山田太郎,やまだたろう,1,5,2級,男,イーグル班
     """
+    import csv
+
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="CSVファイルをアップロードしてください")
     
     try:
         # CSVファイルを読み込み
         contents = await file.read()
-        decoded = contents.decode('utf-8')
+        decoded = contents.decode('utf-8-sig')
         csv_reader = csv.DictReader(io.StringIO(decoded))
         
         scouts_created = 0
@@ -735,6 +1244,7 @@ async def upload_scouts_csv(
                 errors.append(f"行 {row_num}: {str(e)}")
         
         # データベースにコミット
+        bump_version(db, SCOUTS)
         db.commit()
         
         return {
@@ -748,67 +1258,42 @@ async def upload_scouts_csv(
 
 
 @app.post("/api/items/upload-csv", status_code=201)
-async def upload_items_csv(
+def upload_items_csv(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     _: None = Depends(require_admin_access),
 ):
     """CSVファイルから備品データを一括登録
     
-    CSV形式:
-    name,category,status,location,owner_group_id,note
-    テント,キャンプ用品,保管中,倉庫A-1,1,6人用
+    CSV形式（quantity, bring_to_jamboree は省略可）:
+    name,category,status,quantity,bring_to_jamboree,location,owner_group_id,note
+    テント,キャンプ用品,保管中,1,true,倉庫A-1,1,6人用
+
+    ファイルは行単位で読み込み、カテゴリと所有団を事前にまとめて解決したうえで
+    複数行 INSERT をチャンクごとにコミットする（app/item_import.py）。
     """
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="CSVファイルをアップロードしてください")
     
-    try:
-        # CSVファイルを読み込み
-        contents = await file.read()
-        decoded = contents.decode('utf-8')
-        csv_reader = csv.DictReader(io.StringIO(decoded))
-        
-        items_created = 0
-        errors = []
-        
-        for row_num, row in enumerate(csv_reader, start=2):  # ヘッダーを1行目とする
-            try:
-                # owner_group_idを整数に変換
-                owner_group_id = int(row.get('owner_group_id', ''))
-                
-                # 備品データを作成
-                category_name = row.get('category', '').strip()
-                ensure_category(db, category_name)
+    from app.item_import import import_items_csv
 
-                item = ItemModel(
-                    name=row.get('name', '').strip(),
-                    category=category_name,
-                    status=row.get('status', '保管中').strip(),
-                    location=row.get('location', '').strip(),
-                    owner_group_id=owner_group_id,
-                    note=row.get('note', '').strip() or None,
-                )
-                
-                db.add(item)
-                items_created += 1
-                
-            except Exception as e:
-                errors.append(f"行 {row_num}: {str(e)}")
-        
-        # データベースにコミット
-        db.commit()
-        
-        return {
-            "message": f"{items_created}件の備品を登録しました",
-            "created": items_created,
-            "errors": errors if errors else None
-        }
-        
+    try:
+        result = import_items_csv(db, file.file)
     except Exception as e:
+        db.rollback()
         raise HTTPException(status_code=400, detail=f"CSVの処理中にエラーが発生しました: {str(e)}")
 
+    return {
+        "message": f"{result['created']}件の備品を登録しました",
+        "created": result["created"],
+        "failed": result["failed"],
+        "errors": result["errors"] or None,
+    }
+
 
 if __name__ == "__main__":
+    import uvicorn
+
     port = int(os.getenv("PORT", "8000"))
     uvicorn.run("main:app", host="0.0.0.0", port=port)
 
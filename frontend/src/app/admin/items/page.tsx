@@ -1,7 +1,7 @@
 "use client";
 
 import { useEffect, useState } from "react";
-import { Category, Group, Item, ItemCreate } from "@/types/item";
+import { Category, Group, Item, ItemCreate, ItemStats, countByStatus } from "@/types/item";
 import { AdminGate } from "@/components/admin-gate";
 import {
   Card,
@@ -31,6 +31,7 @@ import {
 import {
   API_BASE_URL,
   buildAdminHeaders,
+  buildReadPrimaryHeaders,
   getApiErrorMessage,
 } from "@/lib/admin-auth";
 
@@ -39,6 +40,7 @@ const PHOTO_MAX_SIZE_BYTES = PHOTO_MAX_SIZE_MB * 1024 * 1024;
 
 export default function AdminItemsPage() {
   const [items, setItems] = useState<Item[]>([]);
+  const [itemStats, setItemStats] = useState<ItemStats | null>(null);
   const [groups, setGroups] = useState<Group[]>([]);
   const [categories, setCategories] = useState<Category[]>([]);
   const [loading, setLoading] = useState(true);
@@ -69,7 +71,7 @@ export default function AdminItemsPage() {
         if (statusFilter !== "all") params.append("status", statusFilter);
 
         const url = `${API_BASE_URL}/api/items${params.toString() ? `?${params.toString()}` : ""}`;
-        const response = await fetch(url);
+        const response = await fetch(url, { headers: buildReadPrimaryHeaders() });
         if (!response.ok) {
           setItems([]);
           return;
@@ -88,12 +90,28 @@ export default function AdminItemsPage() {
     void loadItems();
   }, [refreshKey, searchQuery, statusFilter]);
 
+  useEffect(() => {
+    const loadStats = async () => {
+      try {
+        const response = await fetch(`${API_BASE_URL}/api/items/stats`, {
+          headers: buildReadPrimaryHeaders(),
+        });
+        setItemStats(response.ok ? await response.json() : null);
+      } catch (error) {
+        console.error("Failed to fetch item stats:", error);
+        setItemStats(null);
+      }
+    };
+
+    void loadStats();
+  }, [refreshKey]);
+
   useEffect(() => {
     const loadMeta = async () => {
       try {
         const [groupsResponse, categoriesResponse] = await Promise.all([
-          fetch(`${API_BASE_URL}/api/groups`),
-          fetch(`${API_BASE_URL}/api/categories`),
+          fetch(`${API_BASE_URL}/api/groups`, { headers: buildReadPrimaryHeaders() }),
+          fetch(`${API_BASE_URL}/api/categories`, { headers: buildReadPrimaryHeaders() }),
         ]);
 
         const groupsData = groupsResponse.ok ? await groupsResponse.json() : [];
@@ -224,7 +242,7 @@ export default function AdminItemsPage() {
     }
 
     setPreviewPhoto({
-      url: getPhotoUrl(item.image_url),
+      url: getPhotoUrl(item.medium_image_url ?? item.image_url),
       name: item.name,
     });
   };
@@ -254,10 +272,10 @@ export default function AdminItemsPage() {
   };
 
   const stats = {
-    total: items.length,
-    available: items.filter((item) => item.status === "保管中").length,
-    borrowed: items.filter((item) => item.status === "貸出中").length,
-    maintenance: items.filter((item) => item.status === "要メンテ").length,
+    total: itemStats?.total_count ?? 0,
+    available: countByStatus(itemStats, "保管中"),
+    borrowed: countByStatus(itemStats, "貸出中"),
+    maintenance: countByStatus(itemStats, "要メンテ"),
   };
 
   if (loading) {
@@ -622,7 +640,7 @@ export default function AdminItemsPage() {
                               onClick={() => openPhotoPreview(item)}
                             >
                               <img
-                                src={getPhotoUrl(item.image_url)}
+                                src={getPhotoUrl(item.thumbnail_url ?? item.image_url)}
                                 alt={`${item.name}の写真`}
                                 className="h-14 w-14 rounded-md border object-cover transition-opacity hover:opacity-80"
                               />
@@ -658,7 +676,7 @@ export default function AdminItemsPage() {
                           className="block cursor-pointer"
                         >
                           <img
-                            src={getPhotoUrl(item.image_url)}
+                            src={getPhotoUrl(item.thumbnail_url ?? item.image_url)}
                             alt={`${item.name}の写真`}
                             className="h-14 w-14 rounded-md border object-cover transition-opacity hover:opacity-80"
                           />
@@ -25,6 +25,7 @@ import {
 import {
   API_BASE_URL,
   buildAdminHeaders,
+  buildReadPrimaryHeaders,
   getApiErrorMessage,
 } from "@/lib/admin-auth";
 
@@ -54,8 +55,8 @@ export default function AdminLeadersPage() {
         const leadersUrl = `${API_BASE_URL}/api/leaders${params.toString() ? `?${params.toString()}` : ""}`;
 
         const [leadersResponse, groupsResponse] = await Promise.all([
-          fetch(leadersUrl),
-          fetch(`${API_BASE_URL}/api/groups`),
+          fetch(leadersUrl, { headers: buildReadPrimaryHeaders() }),
+          fetch(`${API_BASE_URL}/api/groups`, { headers: buildReadPrimaryHeaders() }),
         ]);
 
         const leadersData = leadersResponse.ok ? await leadersResponse.json() : [];
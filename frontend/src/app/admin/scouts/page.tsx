@@ -25,6 +25,7 @@ import {
 import {
   API_BASE_URL,
   buildAdminHeaders,
+  buildReadPrimaryHeaders,
   getApiErrorMessage,
 } from "@/lib/admin-auth";
 
@@ -57,8 +58,8 @@ export default function AdminScoutsPage() {
         const scoutsUrl = `${API_BASE_URL}/api/scouts${params.toString() ? `?${params.toString()}` : ""}`;
 
         const [scoutsResponse, groupsResponse] = await Promise.all([
-          fetch(scoutsUrl),
-          fetch(`${API_BASE_URL}/api/groups`),
+          fetch(scoutsUrl, { headers: buildReadPrimaryHeaders() }),
+          fetch(`${API_BASE_URL}/api/groups`, { headers: buildReadPrimaryHeaders() }),
         ]);
 
         const scoutsData = scoutsResponse.ok ? await scoutsResponse.json() : [];
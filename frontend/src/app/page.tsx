@@ -2,7 +2,7 @@
 
 import { useEffect, useState } from "react";
 import Link from "next/link";
-import { Item } from "@/types/item";
+import { Item, ItemStats, countByStatus } from "@/types/item";
 import {
   Card,
   CardContent,
@@ -31,6 +31,7 @@ import { API_BASE_URL } from "@/lib/admin-auth";
 
 export default function Home() {
   const [items, setItems] = useState<Item[]>([]);
+  const [itemStats, setItemStats] = useState<ItemStats | null>(null);
   const [loading, setLoading] = useState(true);
   const [searchQuery, setSearchQuery] = useState("");
   const [statusFilter, setStatusFilter] = useState<string>("all");
@@ -63,6 +64,20 @@ export default function Home() {
     fetchItems();
   }, [searchQuery, statusFilter]);
 
+  useEffect(() => {
+    const loadStats = async () => {
+      try {
+        const response = await fetch(`${API_BASE_URL}/api/items/stats`);
+        setItemStats(response.ok ? await response.json() : null);
+      } catch (error) {
+        console.error("Failed to fetch item stats:", error);
+        setItemStats(null);
+      }
+    };
+
+    void loadStats();
+  }, []);
+
   const getPhotoUrl = (path: string) => {
     if (path.startsWith("http://") || path.startsWith("https://")) {
       return path;
@@ -71,10 +86,10 @@ export default function Home() {
   };
 
   const stats = {
-    total: items.length,
-    available: items.filter((item) => item.status === "保管中").length,
-    borrowed: items.filter((item) => item.status === "貸出中").length,
-    maintenance: items.filter((item) => item.status === "要メンテ").length,
+    total: itemStats?.total_count ?? 0,
+    available: countByStatus(itemStats, "保管中"),
+    borrowed: countByStatus(itemStats, "貸出中"),
+    maintenance: countByStatus(itemStats, "要メンテ"),
   };
 
   if (loading) {
@@ -247,14 +262,14 @@ export default function Home() {
                           type="button"
                           onClick={() =>
                             setPreviewPhoto({
-                              url: getPhotoUrl(item.image_url as string),
+                              url: getPhotoUrl(item.medium_image_url ?? (item.image_url as string)),
                               name: item.name,
                             })
                           }
                           className="block cursor-pointer"
                         >
                           <img
-                            src={getPhotoUrl(item.image_url)}
+                            src={getPhotoUrl(item.thumbnail_url ?? item.image_url)}
                             alt={`${item.name}の写真`}
                             className="h-14 w-14 rounded-md border object-cover transition-opacity hover:opacity-80"
                           />
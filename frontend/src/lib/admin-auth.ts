@@ -1,6 +1,7 @@
 export const API_BASE_URL =
   process.env.NEXT_PUBLIC_API_URL ?? "http://127.0.0.1:8001";
 
+
 const ADMIN_PASSWORD_STORAGE_KEY = "jumbory_admin_password";
 
 export function getStoredAdminPassword(): string | null {
@@ -46,6 +47,15 @@ export function buildAdminHeaders(options?: {
   return headers;
 }
 
+// 管理画面は更新直後の一覧を読むため、リードレプリカではなくプライマリ DB から読む
+// （サーバーは管理者パスワードが正しいときだけ X-Read-Primary を受け付ける）
+export function buildReadPrimaryHeaders(): Record<string, string> {
+  return {
+    ...buildAdminHeaders({ includeContentType: false }),
+    "X-Read-Primary": "1",
+  };
+}
+
 export async function authenticateAdmin(password: string): Promise<void> {
   const response = await fetch(`${API_BASE_URL}/api/admin/auth`, {
     method: "POST",
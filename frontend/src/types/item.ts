@@ -23,6 +23,8 @@ export interface Item {
   approved_leader_id: number | null;
   responsible_scout_id: number | null;
   image_url: string | null;
+  thumbnail_url: string | null;
+  medium_image_url: string | null;
   note: string | null;
   group: Group;
 }
@@ -37,3 +39,21 @@ export interface ItemCreate {
   owner_group_id: number;
   note?: string;
 }
+
+export interface ItemStatsBucket {
+  key: string | number | boolean;
+  count: number;
+  quantity: number;
+}
+
+export interface ItemStats {
+  total_count: number;
+  total_quantity: number;
+  by_status: ItemStatsBucket[];
+  by_owner_group: ItemStatsBucket[];
+  by_category: ItemStatsBucket[];
+  by_bring_to_jamboree: ItemStatsBucket[];
+}
+
+export const countByStatus = (stats: ItemStats | null, status: string): number =>
+  stats?.by_status.find((bucket) => bucket.key === status)?.count ?? 0;
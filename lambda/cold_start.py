@@ -0,0 +1,70 @@
+"""コールドスタートの計測
+
+新しい Python プロセスで `handler` を import し、所要時間と最大 RSS を表示する。
+予算（`--budget-ms` / `--budget-mb`）を超えたら終了コード 1 を返すので、CI の確認にも使える。
+
+    python cold_start.py --runs 5 --budget-ms 1500 --budget-mb 150
+
+計測中は `AWS_LAMBDA_FUNCTION_NAME` を設定し、Lambda と同じ起動モード
+（`SCHEMA_MODE=check`、重いモジュールは遅延 import）で読み込む。
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+MEASURE_SCRIPT = """
+import json, resource, sys, time
+start = time.perf_counter()
+import handler
+elapsed = time.perf_counter() - start
+heavy = ["httpx", "supabase", "uvicorn", "PIL", "app.csv_export", "app.item_import"]
+print(json.dumps({
+    "import_ms": elapsed * 1000,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "loaded": [name for name in heavy if name in sys.modules],
+}))
+"""
+
+
+def measure_once() -> dict:
+    env = os.environ.copy()
+    env.setdefault("AWS_LAMBDA_FUNCTION_NAME", "cold-start-measure")
+    env.setdefault("DATABASE_URL", "sqlite:///:memory:")
+    result = subprocess.run(
+        [sys.executable, "-c", MEASURE_SCRIPT],
+        cwd=Path(__file__).resolve().parent,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure Lambda handler cold start")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("COLD_START_BUDGET_MS", "1500")))
+    parser.add_argument("--budget-mb", type=float, default=float(os.getenv("COLD_START_BUDGET_MB", "150")))
+    args = parser.parse_args()
+
+    samples = [measure_once() for _ in range(args.runs)]
+    import_ms = statistics.median(sample["import_ms"] for sample in samples)
+    max_rss_mb = max(sample["max_rss_mb"] for sample in samples)
+    loaded = sorted({name for sample in samples for name in sample["loaded"]})
+
+    print(f"import time (median of {args.runs}): {import_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"max RSS: {max_rss_mb:.1f} MB (budget {args.budget_mb:.0f} MB)")
+    print(f"deferred modules loaded at import: {', '.join(loaded) or 'none'}")
+
+    ok = import_ms <= args.budget_ms and max_rss_mb <= args.budget_mb
+    print("OK" if ok else "OVER BUDGET")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())